@@ -0,0 +1,27 @@
+"""add tipo usuario fecha index
+
+Revision ID: b3f1c2a9d4e7
+Revises: 64ea06d814de
+Create Date: 2026-08-28 09:05:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f1c2a9d4e7'
+down_revision = '64ea06d814de'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tx_tipo_usuario_fecha', 'transactions',
+        ['tipo', 'usuario', 'fecha'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tx_tipo_usuario_fecha', table_name='transactions')
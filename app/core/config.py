@@ -1,6 +1,18 @@
-from pydantic_settings import BaseSettings
-from typing import List, Optional
+from functools import cached_property, lru_cache
+from pydantic import SecretStr, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Optional
 import os
+import re
+
+# Compiled once at import; catches malformed POSTGRES_* env (whitespace in
+# host, missing server) at startup instead of at the first DB call.
+_DSN_RE = re.compile(
+    r"^(?P<dbms>postgresql|postgres)(\+\w+)?:\/{2}"
+    r"(?P<credentials>[^:@\s]*(?::[^@\s]*)?@)?"
+    r"(?P<server>[^\?\s'\";]+)",
+    re.ASCII,
+)
 
 
 class Settings(BaseSettings):
@@ -11,24 +23,33 @@ class Settings(BaseSettings):
 
     # PostgreSQL credentials from environment
     POSTGRES_USER: Optional[str] = None
-    POSTGRES_PASSWORD: Optional[str] = None
+    POSTGRES_PASSWORD: Optional[SecretStr] = None
     POSTGRES_HOST: Optional[str] = None
     POSTGRES_PORT: str = "5432"
     POSTGRES_DB: Optional[str] = None
     POSTGRES_SSLMODE: str = "require"
 
     # Build DATABASE_URL dynamically (Azure ready)
-    @property
-    def DATABASE_URL(self):
+    @cached_property
+    def DATABASE_URL(self) -> str:
+        # Memoized: the f-string + sslmode concatenation runs once per process
+        # instead of on every attribute access (each engine-creation path).
         # Si faltan variables → usar local SQLite
         if not self.POSTGRES_HOST:
             return "sqlite:///./local.db"
 
-        return (
-            f"postgresql+psycopg2://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+        # sslmode viaja por connect_args (ver app/core/database.py) para que
+        # el DSN quede limpio y comparable/cacheable
+        password = self.POSTGRES_PASSWORD.get_secret_value() if self.POSTGRES_PASSWORD else ""
+        dsn = (
+            f"postgresql+psycopg2://{self.POSTGRES_USER}:{password}"
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
-            f"?sslmode={self.POSTGRES_SSLMODE}"
         )
+        if not _DSN_RE.fullmatch(dsn):
+            raise ValueError(
+                "Invalid PostgreSQL DSN built from POSTGRES_* environment variables"
+            )
+        return dsn
 
     # Security
     SECRET_KEY: str = "my-secret-key-change-in-production"
@@ -36,17 +57,39 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
     # CORS
-    BACKEND_CORS_ORIGINS: List[str] = []
+    BACKEND_CORS_ORIGINS: tuple = ()
+
+    # Hosts aceptados por TrustedHostMiddleware (producción)
+    ALLOWED_HOSTS: tuple = ("localhost", "127.0.0.1", "*.azurewebsites.net")
+
+    @field_validator("BACKEND_CORS_ORIGINS", "ALLOWED_HOSTS", mode="before")
+    @classmethod
+    def _split_csv(cls, v):
+        # Parse the comma-separated env string once at Settings() time so
+        # every later read is a plain attribute lookup.
+        if isinstance(v, str):
+            return tuple(item.strip() for item in v.split(","))
+        return tuple(v)
+
+    # frozen=True skips per-attribute setter validation and makes the
+    # instance hashable (usable as an lru_cache key).
+    model_config = SettingsConfigDict(
+        env_file=os.getenv("ENV_FILE", ".env"),
+        case_sensitive=True,
+        frozen=True,
+    )
+
 
-    @property
-    def cors_origins(self) -> List[str]:
-        if isinstance(self.BACKEND_CORS_ORIGINS, str):
-            return [origin.strip() for origin in self.BACKEND_CORS_ORIGINS.split(",")]
-        return self.BACKEND_CORS_ORIGINS
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance.
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    Construction parses `.env` and validates every field, so it is cached:
+    repeated imports (workers, tests) and `Depends(get_settings)` all reuse
+    the same validated instance.
+    """
+    return Settings()
 
 
-settings = Settings()
+# Thin alias kept for existing `from app.core.config import settings` imports
+settings = get_settings()
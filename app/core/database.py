@@ -1,23 +1,51 @@
+from functools import lru_cache
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
-# Create SQLAlchemy engine
-# Configuración especial para SQLite
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=connect_args,
-    pool_pre_ping=True,
-    echo=settings.DEBUG
-)
+
+@lru_cache(maxsize=1)
+def get_engine():
+    """Create (once) and return the process-wide SQLAlchemy engine."""
+    if settings.DATABASE_URL.startswith("sqlite"):
+        # Configuración especial para SQLite
+        return create_engine(
+            settings.DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            pool_pre_ping=True,
+            echo=settings.DEBUG,
+        )
+
+    # Pool real para Postgres: evita handshake TCP+TLS por request bajo
+    # carga y recicla conexiones antes del idle timeout de Azure PG.
+    # values_plus_batch reescribe también los executemany de UPDATE/DELETE
+    # como lotes execute_batch (los INSERT multi-fila ya van como una sola
+    # sentencia VALUES vía insertmanyvalues): N ciclos parse/bind/execute
+    # colapsan en uno, lo que pesa con los RTT de decenas de ms de Azure.
+    return create_engine(
+        settings.DATABASE_URL,
+        connect_args={"sslmode": settings.POSTGRES_SSLMODE},
+        pool_size=20,
+        max_overflow=40,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        executemany_mode="values_plus_batch",
+        executemany_batch_page_size=500,
+        insertmanyvalues_page_size=1000,
+        echo=settings.DEBUG,
+    )
+
+
+engine = get_engine()
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: keep attributes loaded after commit so endpoints
+# returning just-persisted objects don't trigger an extra SELECT per row.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 # Create Base class for models
 Base = declarative_base()
@@ -1,13 +1,82 @@
-from fastapi import FastAPI
+import asyncio
+import json
+import logging
+import os
+import uuid
+
+# Una sola hebra BLAS por proceso: NumPy/pandas se usan desde los worker
+# threads del pool propio y de uvicorn; dejar que OpenBLAS/MKL abran su
+# pool por operación sobre-suscribe los cores. Debe fijarse antes de que
+# los routers importen numpy (pasa recién en el lifespan).
+for _var in ("OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "OMP_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.routers import auth, transactions, dataset_router, graph_router, algorithms_router
+# Model modules are lightweight; import them eagerly so Base.metadata is
+# populated even before the routers (and their heavy deps) load.
+from app.models import transaction, user  # noqa: F401
+
+# Seconds an API request may wait for startup DDL before getting a 503
+STARTUP_TIMEOUT = float(os.getenv("STARTUP_TIMEOUT", "300"))
+
+
+def _include_routers(app: FastAPI) -> None:
+    """Mount the API routers.
+
+    Called from the lifespan setup task instead of module import: each
+    include_router walks and compiles every route's response_model, which
+    dominates cold start, so it runs after the server is already listening.
+    The readiness gate holds API requests until the routes exist. The
+    imports live here too: dataset/graph/algorithms pull in pandas,
+    NumPy and networkx, which would otherwise lengthen cold start and
+    baseline RSS before the first /health answer.
+    """
+    from app.routers import (
+        auth,
+        transactions,
+        dataset_router,
+        graph_router,
+        algorithms_router,
+    )
+
+    api_prefix = settings.API_V1_STR
+    for router in (
+        auth.router,
+        transactions.router,
+        dataset_router.router,
+        graph_router.router,
+        algorithms_router.router,
+    ):
+        app.include_router(router, prefix=api_prefix)
+
+
+async def _do_setup(app: FastAPI) -> None:
+    """Run startup route compilation off the hot path.
+
+    Schema DDL is no longer issued here: `alembic upgrade head` runs once
+    in the container entrypoint (see startup.sh / `make migrate`), so app
+    workers skip the per-boot pg_catalog introspection that
+    `Base.metadata.create_all` performs.
+    """
+    await asyncio.to_thread(_include_routers, app)
+    app.state.ready_event.set()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Mount routers in the background so uvicorn starts listening (and
+    # /health answers) before route compilation finishes.
+    app.state.ready_event = asyncio.Event()
+    setup_task = asyncio.create_task(_do_setup(app))
+    yield
+    setup_task.cancel()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -17,56 +86,55 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+
+@app.middleware("http")
+async def wait_until_ready(request, call_next):
+    """Hold API traffic until startup setup finished; /health stays instant."""
+    if request.url.path not in ("/", "/health"):
+        ready_event = getattr(request.app.state, "ready_event", None)
+        if ready_event is not None and not ready_event.is_set():
+            try:
+                await asyncio.wait_for(ready_event.wait(), timeout=STARTUP_TIMEOUT)
+            except asyncio.TimeoutError:
+                return ORJSONResponse(
+                    status_code=503,
+                    content={"detail": "Service starting up"}
+                )
+    return await call_next(request)
+
 # CORS Middleware
+# Explicit method/header lists let Starlette take its fast equality path
+# instead of expanding wildcards per preflight.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.BACKEND_CORS_ORIGINS,
+    allow_origins=list(settings.BACKEND_CORS_ORIGINS),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 # Trusted Host Middleware (Security)
 if not settings.DEBUG:
     app.add_middleware(
         TrustedHostMiddleware,
-        allowed_hosts=[
-            "localhost",
-            "127.0.0.1",
-            "*.azurewebsites.net"
-        ]
+        allowed_hosts=list(settings.ALLOWED_HOSTS)
     )
 
-# Include routers
-app.include_router(auth.router, prefix=settings.API_V1_STR)
-app.include_router(transactions.router, prefix=settings.API_V1_STR)
-app.include_router(dataset_router.router, prefix=settings.API_V1_STR)
-app.include_router(graph_router.router, prefix=settings.API_V1_STR)
-app.include_router(algorithms_router.router, prefix=settings.API_V1_STR)
-
-
-@app.get("/")
-async def root():
-    """Root endpoint."""
-    return {
-        "message": "Welcome to Finanzen API",
-        "version": "1.0.0",
-        "docs": f"{settings.API_V1_STR}/docs"
-    }
+# Static payloads serialized once at import; the handlers return the
+# prebuilt bytes instead of re-encoding an identical dict per request.
+ROOT_PAYLOAD_BYTES = json.dumps({
+    "message": "Welcome to Finanzen API",
+    "version": "1.0.0",
+    "docs": f"{settings.API_V1_STR}/docs"
+}).encode("utf-8")
 
+HEALTH_PAYLOAD_BYTES = json.dumps({"status": "healthy"}).encode("utf-8")
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
-
-
-@app.get(f"{settings.API_V1_STR}/info")
-async def api_info():
-    """API information endpoint."""
-    return {
+INFO_PAYLOAD_BYTES = json.dumps({
         "name": settings.PROJECT_NAME,
         "version": "2.0.0",
         "api_prefix": settings.API_V1_STR,
@@ -92,31 +160,100 @@ async def api_info():
             "transactions": ["/transactions", "/transactions/{id}"],
             "auth": ["/auth/register", "/auth/login"]
         }
-    }
+    }).encode("utf-8")
+
+
+@app.get("/")
+async def root():
+    """Root endpoint."""
+    return Response(content=ROOT_PAYLOAD_BYTES, media_type="application/json")
+
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint."""
+    return Response(content=HEALTH_PAYLOAD_BYTES, media_type="application/json")
+
+
+@app.get(f"{settings.API_V1_STR}/info")
+async def api_info():
+    """API information endpoint."""
+    return Response(content=INFO_PAYLOAD_BYTES, media_type="application/json")
 
 
 # Exception handlers
+# The payloads are constant, so serialize them once at import instead of
+# re-encoding per 404/500 (scanner traffic hammers these paths).
+NOT_FOUND_BODY = ORJSONResponse({"detail": "Resource not found"}).body
+INTERNAL_ERROR_BODY = ORJSONResponse({"detail": "Internal server error"}).body
+
+
+@app.exception_handler(ValueError)
+async def value_error_handler(request, exc):
+    """Errores de dominio de los algoritmos (nodo inexistente, peso
+    negativo, etc.) se traducen a 400 aquí en vez de envolver cada
+    endpoint en try/except sobre el happy path."""
+    return ORJSONResponse({"detail": str(exc)}, status_code=400)
+
+
+@app.exception_handler(KeyError)
+async def key_error_handler(request, exc):
+    return ORJSONResponse(
+        {"detail": f"Clave inexistente: {exc}"}, status_code=400
+    )
+
+
+logger = logging.getLogger("app")
+
+
+@app.exception_handler(Exception)
+async def unhandled_error_handler(request, exc):
+    """Red de seguridad para errores no previstos: el traceback queda en
+    el log con un id de correlación y el cliente recibe un 500 genérico.
+    Los routers ya no envuelven su happy path en try/except Exception."""
+    error_id = uuid.uuid4().hex[:12]
+    logger.error(
+        "Unhandled error %s on %s %s",
+        error_id, request.method, request.url.path,
+        exc_info=exc,
+    )
+    return ORJSONResponse(
+        {"detail": "Internal server error", "error_id": error_id},
+        status_code=500,
+    )
+
+
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return JSONResponse(
+    return Response(
+        content=NOT_FOUND_BODY,
         status_code=404,
-        content={"detail": "Resource not found"}
+        media_type="application/json"
     )
 
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
-    return JSONResponse(
+    return Response(
+        content=INTERNAL_ERROR_BODY,
         status_code=500,
-        content={"detail": "Internal server error"}
+        media_type="application/json"
     )
 
 
 if __name__ == "__main__":
     import uvicorn
+
+    # uvloop + httptools (bundled with uvicorn[standard]) roughly double
+    # event-loop throughput; workers scale to cores. reload requires a
+    # single worker, so it only kicks in for DEBUG runs.
+    workers = 1 if settings.DEBUG else (os.cpu_count() or 1)
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.DEBUG
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        reload=settings.DEBUG and workers == 1
     )
@@ -0,0 +1,43 @@
+"""
+Lectura columnar (SoA) de transacciones vía SQLAlchemy Core.
+
+La hidratación ORM crea un objeto Python por fila (AoS), lo que domina el
+tiempo de construcción de grafos con lotes grandes. Este helper devuelve
+arrays NumPy contiguos por columna para que los builders operen en modo
+columnar sin objetos intermedios.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+
+from app.models.transaction import Transaction
+
+_tx = Transaction.__table__
+
+
+def load_tx_arrays(
+    conn: Connection,
+    usuario: Optional[str] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Carga (fecha, categoria, monto) como arrays columnar NumPy.
+
+    Args:
+        conn: Conexión Core (engine.connect())
+        usuario: Filtro opcional por usuario
+
+    Returns:
+        Tupla (fechas datetime64[D], categorias object, montos float64)
+    """
+    stmt = select(_tx.c.fecha, _tx.c.categoria, _tx.c.monto)
+    if usuario is not None:
+        stmt = stmt.where(_tx.c.usuario == usuario)
+
+    rows = conn.execute(stmt).fetchall()
+    return (
+        np.asarray([r.fecha for r in rows], dtype="datetime64[D]"),
+        np.asarray([r.categoria for r in rows], dtype=object),
+        np.asarray([r.monto for r in rows], dtype=np.float64),
+    )
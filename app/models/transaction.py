@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Date
+from sqlalchemy import Column, Enum, Index, Integer, String, Numeric, DateTime, ForeignKey, Date
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -6,16 +6,25 @@ from app.core.database import Base
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Los graph builders filtran por usuario y ordenan por fecha
+        Index("ix_tx_usuario_fecha", "usuario", "fecha"),
+        # GraphService filtra tipo='egreso' y ordena por (usuario, fecha):
+        # el índice compuesto cubre el predicado y el orden en una pasada
+        Index("ix_tx_tipo_usuario_fecha", "tipo", "usuario", "fecha"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    fecha = Column(Date, nullable=False)
-    tipo = Column(String, nullable=False)  # ingreso/egreso
-    categoria = Column(String, nullable=False)
+    fecha = Column(Date, nullable=False, index=True)
+    tipo = Column(Enum("ingreso", "egreso", name="tipo_enum"), nullable=False)
+    categoria = Column(String, nullable=False, index=True)
     subcategoria = Column(String, nullable=True)
     descripcion = Column(String, nullable=True)
     metodo_pago = Column(String, nullable=True)
-    monto = Column(Float, nullable=False)
-    usuario = Column(String, nullable=False)
+    # asdecimal=False: almacenamiento exacto en DB, floats hacia Python
+    # para que los builders de grafos no mezclen Decimal con float
+    monto = Column(Numeric(12, 2, asdecimal=False), nullable=False)
+    usuario = Column(String, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationship
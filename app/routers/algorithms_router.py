@@ -2,14 +2,132 @@
 Algorithms Router - Endpoints para todos los algoritmos de grafos y optimización
 Incluye: BFS, DFS, Dijkstra, Bellman-Ford, Floyd-Warshall, MST (Prim/Kruskal), DP (Knapsack)
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import Dict, Any, List, Tuple, Optional
-from pydantic import BaseModel, Field
-from app.core.database import get_db
+import asyncio
+import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+from fastapi import APIRouter, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Dict, Any, List, Literal, Tuple, Optional
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 from app.services.algorithms_service import algorithms_service
+from app.utils.graph_csr import edges_to_csr
 
-router = APIRouter(prefix="/algorithms", tags=["Algorithms"])
+# orjson serializa los resultados grandes (matrices de Floyd-Warshall,
+# all-paths de Dijkstra) en C en lugar de recorrer dicts en Python
+router = APIRouter(
+    prefix="/algorithms",
+    tags=["Algorithms"],
+    default_response_class=ORJSONResponse,
+)
+
+
+class _ResultCache:
+    """LRU acotado para resultados de endpoints idempotentes.
+
+    Los workloads de exploración en UI repiten el mismo POST muchas veces;
+    un hit convierte el O(V³) de Floyd-Warshall en un lookup O(1).
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self._data = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+        result = compute()
+        with self._lock:
+            self._data[key] = result
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+        return result
+
+
+_fw_cache = _ResultCache()
+_dijkstra_all_cache = _ResultCache()
+
+
+def _edges_key(request) -> bytes:
+    """Clave estable desde los buffers SoA ya construidos en validación."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(request._u.tobytes())
+    h.update(request._v.tobytes())
+    h.update(request._w.tobytes())
+    # Los vértices aislados no aparecen en u/v pero sí cambian el número
+    # de vértices (y el tamaño de la matriz de Floyd-Warshall): plegar el
+    # conteo derivado igual que lo derivan los servicios (max id + 1)
+    n = max(request.graph, default=-1) + 1
+    if request._v.size:
+        n = max(n, int(request._u.max()) + 1, int(request._v.max()) + 1)
+    h.update(n.to_bytes(8, "little", signed=True))
+    return h.digest()
+
+
+def _graph_to_csr(
+    graph: Dict[int, List],
+) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Convierte el dict de adyacencia a formato CSR (SoA).
+
+    Los algoritmos aguas abajo recorren así arrays contiguos int32/float64
+    en lugar de dict/list/tuple con punteros e ints boxed: muchos menos
+    bytes por arista y acceso prefetchable.
+
+    Returns:
+        (indptr, indices, weights) — weights es None para grafos sin pesos.
+        Devuelve (None, None, None) si los nodos no son aptos para CSR
+        (ids negativos), en cuyo caso se usa la ruta dict.
+    """
+    if not graph:
+        return np.zeros(1, dtype=np.int32), np.zeros(0, dtype=np.int32), None
+
+    weighted = any(
+        neighbors and isinstance(neighbors[0], (tuple, list))
+        for neighbors in graph.values()
+    )
+    if min(graph) < 0:
+        return None, None, None
+    max_node = max(graph)
+    for neighbors in graph.values():
+        for entry in neighbors:
+            v = entry[0] if weighted else entry
+            if v < 0:
+                return None, None, None
+            if v > max_node:
+                max_node = v
+
+    n = max_node + 1
+    counts = np.zeros(n + 1, dtype=np.int32)
+    for u, neighbors in graph.items():
+        counts[u + 1] = len(neighbors)
+    indptr = np.cumsum(counts, dtype=np.int32)
+
+    num_edges = int(indptr[-1])
+    indices = np.empty(num_edges, dtype=np.int32)
+    # float32 basta para pesos financieros y reduce a la mitad el tráfico
+    # de memoria en los kernels limitados por ancho de banda
+    weights = np.empty(num_edges, dtype=np.float32) if weighted else None
+    for u, neighbors in graph.items():
+        offset = indptr[u]
+        if weighted:
+            for i, (v, w) in enumerate(neighbors):
+                indices[offset + i] = v
+                weights[offset + i] = w
+        else:
+            for i, v in enumerate(neighbors):
+                indices[offset + i] = v
+
+    return indptr, indices, weights
 
 
 # ==================== Pydantic Models for BFS ====================
@@ -25,13 +143,82 @@ class BFSRequest(BaseModel):
         description="Nodo inicial para la búsqueda BFS"
     )
 
-    class Config:
-        json_schema_extra = {
+    # CSR construido una sola vez en validación; los endpoints lo reusan
+    # sin volver a recorrer el dict
+    _indptr: Optional[np.ndarray] = PrivateAttr(default=None)
+    _indices: Optional[np.ndarray] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _build_csr(self):
+        self._indptr, self._indices, _ = _graph_to_csr(self.graph)
+        return self
+
+    # ConfigDict en lugar del shim deprecado `class Config`: el modelo se
+    # compila directo contra pydantic-core (validación en Rust) sin la
+    # conversión de compatibilidad v1
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "graph": {0: [1, 2], 1: [0, 3], 2: [0, 3], 3: [1, 2]},
                 "start": 0
             }
         }
+    )
+
+
+class BFSRequestCSR(BaseModel):
+    """Request model para BFS con el grafo ya en formato CSR.
+
+    Evita por completo la coerción de claves string→int que el dict de
+    adyacencia fuerza en validación para grafos grandes.
+    """
+    n: int = Field(..., ge=0, description="Número de nodos")
+    indptr: List[int] = Field(..., description="Offsets CSR por nodo (n+1 valores)")
+    indices: List[int] = Field(..., description="Vecinos aplanados")
+    start: int = Field(...)
+
+
+class BFSBatchRequest(BaseModel):
+    """Request model para BFS en lote: varios nodos iniciales, un grafo.
+
+    El CSR se construye una sola vez y se comparte entre todas las
+    fuentes, amortizando el parseo/validación del grafo que una request
+    por fuente repetiría.
+    """
+    graph: Dict[int, List[int]] = Field(
+        ...,
+        description="Grafo representado como diccionario de adyacencia {nodo: [vecinos]}"
+    )
+    starts: List[int] = Field(
+        ...,
+        description="Nodos iniciales; se ejecuta un BFS por cada uno"
+    )
+
+    _indptr: Optional[np.ndarray] = PrivateAttr(default=None)
+    _indices: Optional[np.ndarray] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _build_csr(self):
+        self._indptr, self._indices, _ = _graph_to_csr(self.graph)
+        return self
+
+
+class BFSMultiSourceRequest(BaseModel):
+    """Request model para BFS multi-fuente: una frontera fusionada.
+
+    A diferencia de /bfs/batch (un BFS completo por fuente), aquí todas
+    las fuentes comparten la frontera y cada nodo se visita una sola vez
+    a distancia de su fuente más cercana.
+    """
+    graph: Dict[int, List[int]] = Field(
+        ...,
+        description="Grafo representado como diccionario de adyacencia {nodo: [vecinos]}"
+    )
+    sources: List[int] = Field(
+        ...,
+        min_length=1,
+        description="Nodos iniciales; arrancan todos a distancia 0"
+    )
 
 
 class BFSPathRequest(BaseModel):
@@ -56,52 +243,114 @@ class DFSPathRequest(BaseModel):
     end: int = Field(...)
 
 
-# ==================== Pydantic Models for Dijkstra ====================
+# ==================== Weighted graph base model ====================
 
-class DijkstraRequest(BaseModel):
-    """Request model para Dijkstra."""
+class WeightedGraphRequest(BaseModel):
+    """Base para requests con grafo ponderado.
+
+    Aplana las aristas una sola vez en validación a arrays paralelos
+    u/v/w (SoA): los servicios pueden construir CSR o alimentar NumPy
+    directamente sin recorrer tuplas boxed por arista.
+    """
     graph: Dict[int, List[Tuple[int, float]]] = Field(
         ...,
         description="Grafo con pesos {nodo: [(vecino, peso), ...]}"
     )
+
+    _u: Optional[np.ndarray] = PrivateAttr(default=None)
+    _v: Optional[np.ndarray] = PrivateAttr(default=None)
+    _w: Optional[np.ndarray] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _flatten_edges(self):
+        num_edges = sum(len(neighbors) for neighbors in self.graph.values())
+        u = np.empty(num_edges, dtype=np.int32)
+        v = np.empty(num_edges, dtype=np.int32)
+        w = np.empty(num_edges, dtype=np.float32)
+        i = 0
+        for node, neighbors in self.graph.items():
+            for neighbor, weight in neighbors:
+                u[i] = node
+                v[i] = neighbor
+                w[i] = weight
+                i += 1
+        self._u, self._v, self._w = u, v, w
+        return self
+
+
+class WeightedEdgeList(BaseModel):
+    """Formato de cable canónico para grafos ponderados: arrays paralelos.
+
+    Evita el dict {nodo: [(vecino, peso)]} y su coerción por arista.
+    """
+    u: List[int] = Field(..., description="Nodos origen")
+    v: List[int] = Field(..., description="Nodos destino")
+    w: List[float] = Field(..., description="Pesos")
+
+    def to_graph(self) -> Dict[int, List[Tuple[int, float]]]:
+        """Adaptador al formato dict para servicios que aún lo requieren."""
+        graph: Dict[int, List[Tuple[int, float]]] = {}
+        for a, b, weight in zip(self.u, self.v, self.w):
+            graph.setdefault(a, []).append((b, weight))
+        return graph
+
+
+# ==================== Pydantic Models for Dijkstra ====================
+
+class DijkstraRequest(WeightedGraphRequest):
+    """Request model para Dijkstra."""
     start: int = Field(...)
+    skip_stale: bool = Field(
+        default=True,
+        description="Descarta entradas obsoletas del heap (menos operaciones de heap, mismo resultado)"
+    )
+    format: Literal["json", "binary"] = Field(
+        default="json",
+        description="binary devuelve dist/parent como buffers int32/float32 en base64 (~4x menos payload para V grande)"
+    )
 
 
-class DijkstraPathRequest(BaseModel):
+class DijkstraPathRequest(WeightedGraphRequest):
     """Request model para camino más corto con Dijkstra."""
-    graph: Dict[int, List[Tuple[int, float]]] = Field(...)
     start: int = Field(...)
     end: int = Field(...)
 
 
+class DeltaSteppingRequest(WeightedGraphRequest):
+    """Request model para SSSP por delta-stepping."""
+    start: int = Field(...)
+    delta: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Ancho de cubeta; si se omite se estima desde el grafo"
+    )
+
+
 # ==================== Pydantic Models for Bellman-Ford ====================
 
-class BellmanFordRequest(BaseModel):
+class BellmanFordRequest(WeightedGraphRequest):
     """Request model para Bellman-Ford."""
-    graph: Dict[int, List[Tuple[int, float]]] = Field(...)
     start: int = Field(...)
 
 
-class BellmanFordPathRequest(BaseModel):
+class BellmanFordPathRequest(WeightedGraphRequest):
     """Request model para camino más corto con Bellman-Ford."""
-    graph: Dict[int, List[Tuple[int, float]]] = Field(...)
     start: int = Field(...)
     end: int = Field(...)
 
 
 # ==================== Pydantic Models for Floyd-Warshall ====================
 
-class FloydWarshallRequest(BaseModel):
+class FloydWarshallRequest(WeightedGraphRequest):
     """Request model para Floyd-Warshall."""
-    graph: Dict[int, List[Tuple[int, float]]] = Field(
-        ...,
-        description="Grafo con pesos para calcular todos los caminos más cortos"
+    format: Literal["json", "binary"] = Field(
+        default="json",
+        description="binary devuelve la matriz de distancias como buffer float32 en base64"
     )
 
 
-class FloydWarshallPathRequest(BaseModel):
+class FloydWarshallPathRequest(WeightedGraphRequest):
     """Request model para camino más corto con Floyd-Warshall."""
-    graph: Dict[int, List[Tuple[int, float]]] = Field(...)
     start: int = Field(...)
     end: int = Field(...)
 
@@ -120,9 +369,8 @@ class KruskalRequest(BaseModel):
     )
 
 
-class KruskalGraphRequest(BaseModel):
+class KruskalGraphRequest(WeightedGraphRequest):
     """Request model para Kruskal desde representación de grafo."""
-    graph: Dict[int, List[Tuple[int, float]]] = Field(...)
     num_vertices: int = Field(...)
 
 
@@ -136,9 +384,8 @@ class PrimRequest(BaseModel):
     )
 
 
-class PrimGraphRequest(BaseModel):
+class PrimGraphRequest(WeightedGraphRequest):
     """Request model para Prim desde representación de grafo."""
-    graph: Dict[int, List[Tuple[int, float]]] = Field(...)
     num_vertices: int = Field(...)
     start: int = Field(default=0)
 
@@ -161,14 +408,15 @@ class Knapsack01Request(BaseModel):
         description="Capacidad de la mochila"
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "weights": [2, 3, 4, 5],
                 "values": [3, 4, 5, 6],
                 "capacity": 5
             }
         }
+    )
 
 
 class KnapsackUnboundedRequest(BaseModel):
@@ -196,13 +444,35 @@ class SubsetSumRequest(BaseModel):
         description="Suma objetivo"
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "numbers": [3, 34, 4, 12, 5, 2],
                 "target": 9
             }
         }
+    )
+
+
+def _validate_start(graph: Dict[int, List], start: int) -> None:
+    """
+    Valida explícitamente que el nodo inicial exista en el grafo.
+
+    Reemplaza el patrón de dejar que el servicio falle y atrapar la
+    excepción: el chequeo es una búsqueda de clave en el caso común y
+    mantiene el happy path sin manejo de errores.
+
+    Raises:
+        ValueError: Si el nodo no es clave ni vecino en el grafo
+    """
+    if start in graph:
+        return
+    for neighbors in graph.values():
+        for entry in neighbors:
+            node = entry[0] if isinstance(entry, (tuple, list)) else entry
+            if node == start:
+                return
+    raise ValueError(f"El nodo inicial {start} no existe en el grafo")
 
 
 # ==================== BFS Endpoints ====================
@@ -223,18 +493,136 @@ def execute_bfs(request: BFSRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si el grafo es inválido
     """
-    try:
-        result = algorithms_service.bfs_traversal(request.graph, request.start)
+    if not request.graph:
+        # Grafo vacío: resultado trivial sin pasar por el servicio
         return {
             "algorithm": "Breadth-First Search (BFS)",
             "complexity": "O(V + E)",
-            "result": result
+            "result": {
+                "order": [request.start],
+                "distances": {request.start: 0},
+                "parents": {request.start: None},
+                "visited_count": 1
+            }
         }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error ejecutando BFS: {str(e)}"
+    _validate_start(request.graph, request.start)
+    if request._indptr is not None:
+        result = algorithms_service.bfs_traversal_csr(
+            request._indptr, request._indices, request.start
         )
+    else:
+        # Ids de nodo no aptos para CSR: ruta dict original
+        result = algorithms_service.bfs_traversal(request.graph, request.start)
+    return {
+        "algorithm": "Breadth-First Search (BFS)",
+        "complexity": "O(V + E)",
+        "result": result
+    }
+
+
+@router.post("/bfs/csr", status_code=status.HTTP_200_OK)
+def execute_bfs_csr(request: BFSRequestCSR) -> Dict[str, Any]:
+    """
+    Ejecuta BFS recibiendo el grafo directamente en formato CSR.
+
+    Complejidad: O(V + E)
+
+    Args:
+        request: Arrays indptr/indices y nodo inicial
+
+    Returns:
+        Orden de visita, distancias y información de padres
+
+    Raises:
+        HTTPException: Si los arrays CSR son inconsistentes
+    """
+    if len(request.indptr) != request.n + 1:
+        raise ValueError("indptr debe tener n+1 elementos")
+    indptr = np.asarray(request.indptr, dtype=np.int32)
+    indices = np.asarray(request.indices, dtype=np.int32)
+    # Un vecino >= n reventaría con IndexError adentro del BFS y uno
+    # negativo aliasaría por el indexado negativo: rechazar ambos acá
+    if indices.size and (
+        int(indices.min()) < 0 or int(indices.max()) >= request.n
+    ):
+        raise ValueError("indices debe contener nodos en el rango [0, n)")
+    result = algorithms_service.bfs_traversal_csr(indptr, indices, request.start)
+    return {
+        "algorithm": "Breadth-First Search (BFS)",
+        "complexity": "O(V + E)",
+        "result": result
+    }
+
+
+@router.post("/bfs/batch", status_code=status.HTTP_200_OK)
+def execute_bfs_batch(request: BFSBatchRequest) -> Dict[str, Any]:
+    """
+    Ejecuta BFS desde varios nodos iniciales sobre el mismo grafo.
+
+    El grafo se parsea y convierte a CSR una sola vez; las fuentes corren
+    en un pool de hilos compartiendo los arrays inmutables (los buffers
+    de trabajo son thread-local, ver app.utils.bfs).
+
+    Complejidad: O(S * (V + E)) para S fuentes
+
+    Args:
+        request: Grafo y lista de nodos iniciales
+
+    Returns:
+        Resultados de BFS alineados con `starts`
+    """
+    if request._indptr is not None:
+        def run(start: int) -> Dict[str, Any]:
+            return algorithms_service.bfs_traversal_csr(
+                request._indptr, request._indices, start
+            )
+    else:
+        def run(start: int) -> Dict[str, Any]:
+            return algorithms_service.bfs_traversal(request.graph, start)
+
+    if not request.starts:
+        results = []
+    elif len(request.starts) == 1:
+        results = [run(request.starts[0])]
+    else:
+        workers = min(len(request.starts), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, request.starts))
+
+    return {
+        "algorithm": "Breadth-First Search (BFS) batch",
+        "complexity": "O(S * (V + E))",
+        "starts": request.starts,
+        "results": results
+    }
+
+
+@router.post("/bfs/multi-source", status_code=status.HTTP_200_OK)
+def execute_bfs_multi_source(request: BFSMultiSourceRequest) -> Dict[str, Any]:
+    """
+    Ejecuta BFS desde varias fuentes con una sola frontera fusionada.
+
+    Cada nodo alcanzado queda a distancia de su fuente más cercana y
+    `nearest_source` entrega la partición resultante; una sola pasada
+    O(V + E) en lugar de un BFS completo por fuente.
+
+    Complejidad: O(V + E)
+
+    Args:
+        request: Grafo y lista de fuentes
+
+    Returns:
+        Distancias, padres y fuente más cercana por nodo
+
+    Raises:
+        HTTPException: Si ocurre error
+    """
+    result = algorithms_service.bfs_multi_source(request.graph, request.sources)
+    return {
+        "algorithm": "BFS (Multi-Source)",
+        "complexity": "O(V + E)",
+        "result": result
+    }
 
 
 @router.post("/bfs/shortest-path", status_code=status.HTTP_200_OK)
@@ -253,22 +641,16 @@ def bfs_shortest_path(request: BFSPathRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.bfs_shortest_path(
-            request.graph,
-            request.start,
-            request.end
-        )
-        return {
-            "algorithm": "BFS Shortest Path",
-            "complexity": "O(V + E)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en BFS shortest path: {str(e)}"
-        )
+    result = algorithms_service.bfs_shortest_path(
+        request.graph,
+        request.start,
+        request.end
+    )
+    return {
+        "algorithm": "BFS Shortest Path",
+        "complexity": "O(V + E)",
+        "result": result
+    }
 
 
 @router.post("/bfs/levels", status_code=status.HTTP_200_OK)
@@ -287,18 +669,12 @@ def bfs_levels(request: BFSRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.bfs_levels(request.graph, request.start)
-        return {
-            "algorithm": "BFS Levels",
-            "complexity": "O(V + E)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en BFS levels: {str(e)}"
-        )
+    result = algorithms_service.bfs_levels(request.graph, request.start)
+    return {
+        "algorithm": "BFS Levels",
+        "complexity": "O(V + E)",
+        "result": result
+    }
 
 
 # ==================== DFS Endpoints ====================
@@ -319,18 +695,20 @@ def execute_dfs(request: DFSRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si el grafo es inválido
     """
-    try:
-        result = algorithms_service.dfs_traversal(request.graph, request.start)
+    if not request.graph:
+        # Grafo vacío: resultado trivial sin pasar por el servicio
         return {
             "algorithm": "Depth-First Search (DFS)",
             "complexity": "O(V + E)",
-            "result": result
+            "result": {"order": [request.start], "visited_count": 1}
         }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error ejecutando DFS: {str(e)}"
-        )
+    _validate_start(request.graph, request.start)
+    result = algorithms_service.dfs_traversal(request.graph, request.start)
+    return {
+        "algorithm": "Depth-First Search (DFS)",
+        "complexity": "O(V + E)",
+        "result": result
+    }
 
 
 @router.post("/dfs/recursive", status_code=status.HTTP_200_OK)
@@ -349,18 +727,12 @@ def dfs_recursive(request: DFSRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.dfs_recursive_traversal(request.graph, request.start)
-        return {
-            "algorithm": "DFS (Recursive)",
-            "complexity": "O(V + E)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en DFS recursivo: {str(e)}"
-        )
+    result = algorithms_service.dfs_recursive_traversal(request.graph, request.start)
+    return {
+        "algorithm": "DFS (Recursive)",
+        "complexity": "O(V + E)",
+        "result": result
+    }
 
 
 @router.post("/dfs/all-paths", status_code=status.HTTP_200_OK)
@@ -379,22 +751,16 @@ def dfs_all_paths(request: DFSPathRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.dfs_all_paths(
-            request.graph,
-            request.start,
-            request.end
-        )
-        return {
-            "algorithm": "DFS All Paths",
-            "complexity": "O(V^V) worst case",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en DFS all paths: {str(e)}"
-        )
+    result = algorithms_service.dfs_all_paths(
+        request.graph,
+        request.start,
+        request.end
+    )
+    return {
+        "algorithm": "DFS All Paths",
+        "complexity": "O(V^V) worst case",
+        "result": result
+    }
 
 
 @router.post("/dfs/detect-cycle", status_code=status.HTTP_200_OK)
@@ -413,18 +779,12 @@ def detect_cycle(request: DFSRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.detect_cycle(request.graph)
-        return {
-            "algorithm": "Cycle Detection (DFS)",
-            "complexity": "O(V + E)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error detectando ciclos: {str(e)}"
-        )
+    result = algorithms_service.detect_cycle(request.graph)
+    return {
+        "algorithm": "Cycle Detection (DFS)",
+        "complexity": "O(V + E)",
+        "result": result
+    }
 
 
 @router.post("/dfs/topological-sort", status_code=status.HTTP_200_OK)
@@ -443,18 +803,12 @@ def topological_sort(request: DFSRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si el grafo contiene ciclos
     """
-    try:
-        result = algorithms_service.topological_sort(request.graph)
-        return {
-            "algorithm": "Topological Sort (DFS)",
-            "complexity": "O(V + E)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en ordenamiento topológico: {str(e)}"
-        )
+    result = algorithms_service.topological_sort(request.graph)
+    return {
+        "algorithm": "Topological Sort (DFS)",
+        "complexity": "O(V + E)",
+        "result": result
+    }
 
 
 # ==================== Dijkstra Endpoints ====================
@@ -477,18 +831,62 @@ def execute_dijkstra(request: DijkstraRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si el grafo es inválido
     """
-    try:
-        result = algorithms_service.dijkstra_shortest_paths(request.graph, request.start)
+    # CSR desde los arrays SoA ya construidos en validación: el bucle de
+    # Dijkstra escanea aristas contiguas en vez de tuplas Python. Los ids
+    # negativos no son indexables como CSR y caen a la ruta dict.
+    csr_ok = (
+        request.start >= 0
+        and (not request.graph or min(request.graph) >= 0)
+        and (request._v.size == 0 or int(request._v.min()) >= 0)
+    )
+    if request.format == "binary" and not csr_ok:
+        # Los arrays densos indexados por nodo no pueden representar ids
+        # negativos: dist[-1] aliasaría el último slot en vez de fallar
+        raise ValueError("binary format requires non-negative node ids")
+    if csr_ok:
+        n = int(request.start) + 1
+        if request.graph:
+            n = max(n, max(request.graph) + 1)
+        if request._v.size:
+            n = max(n, int(request._v.max()) + 1)
+        indptr, indices, weights = edges_to_csr(
+            request._u, request._v, request._w, n
+        )
+        result = algorithms_service.dijkstra_shortest_paths_csr(
+            indptr, indices, weights, request.start
+        )
+    else:
+        result = algorithms_service.dijkstra_shortest_paths(
+            request.graph, request.start, skip_stale=request.skip_stale
+        )
+    if request.format == "binary":
+        # Arrays densos indexados por nodo: -1 / inf marcan "no alcanzado".
+        # orjson codifica un string base64 sin iterar V objetos Python.
+        n = int(request.start) + 1
+        if request._u.size:
+            n = max(n, int(request._u.max()) + 1, int(request._v.max()) + 1)
+        dist = np.full(n, np.inf, dtype=np.float32)
+        parent = np.full(n, -1, dtype=np.int32)
+        for node, d in result["distances"].items():
+            dist[node] = d
+        for node, p in result["parents"].items():
+            if p is not None:
+                parent[node] = p
         return {
             "algorithm": "Dijkstra Shortest Paths",
             "complexity": "O((V + E) log V)",
-            "result": result
+            "format": "binary",
+            "shape": [n],
+            "dist_dtype": "float32",
+            "parent_dtype": "int32",
+            "dist_b64": base64.b64encode(dist.tobytes()).decode(),
+            "parent_b64": base64.b64encode(parent.tobytes()).decode()
         }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error ejecutando Dijkstra: {str(e)}"
-        )
+    return {
+        "algorithm": "Dijkstra Shortest Paths",
+        "complexity": "O((V + E) log V)",
+        "result": result
+    }
 
 
 @router.post("/dijkstra/path", status_code=status.HTTP_200_OK)
@@ -507,18 +905,71 @@ def dijkstra_path(request: DijkstraPathRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.dijkstra_path(request.graph, request.start, request.end)
-        return {
-            "algorithm": "Dijkstra Path",
-            "complexity": "O((V + E) log V)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en Dijkstra path: {str(e)}"
-        )
+    result = algorithms_service.dijkstra_path(request.graph, request.start, request.end)
+    return {
+        "algorithm": "Dijkstra Path",
+        "complexity": "O((V + E) log V)",
+        "result": result
+    }
+
+
+@router.post("/delta-stepping", status_code=status.HTTP_200_OK)
+def execute_delta_stepping(request: DeltaSteppingRequest) -> Dict[str, Any]:
+    """
+    Encuentra los caminos más cortos desde un nodo usando delta-stepping.
+
+    Alternativa a /dijkstra para pesos positivos: relaja por cubetas de
+    distancia casi igual en lugar de pagar el heap por operación.
+
+    Complejidad: O((V + E) log V), con mejores constantes en grafos grandes
+
+    Args:
+        request: Grafo, nodo inicio y ancho de cubeta opcional
+
+    Returns:
+        Distancias y padres desde el nodo inicial
+
+    Raises:
+        HTTPException: Si ocurre error
+    """
+    result = algorithms_service.delta_stepping_shortest_paths(
+        request.graph, request.start, request.delta
+    )
+    return {
+        "algorithm": "Delta-Stepping",
+        "complexity": "O((V + E) log V)",
+        "result": result
+    }
+
+
+@router.post("/dijkstra/path-bidirectional", status_code=status.HTTP_200_OK)
+def dijkstra_path_bidirectional(request: DijkstraPathRequest) -> Dict[str, Any]:
+    """
+    Camino más corto entre dos nodos usando Dijkstra bidireccional.
+
+    Crece una frontera desde el inicio y otra desde el final y termina
+    cuando se encuentran: para consultas de un solo par asienta muchos
+    menos nodos que /dijkstra/path en grafos dispersos grandes.
+
+    Complejidad: O((V + E) log V), con constantes menores por par
+
+    Args:
+        request: Grafo, nodo inicio y nodo final
+
+    Returns:
+        Camino más corto y su distancia
+
+    Raises:
+        HTTPException: Si ocurre error
+    """
+    result = algorithms_service.dijkstra_bidirectional_path(
+        request.graph, request.start, request.end
+    )
+    return {
+        "algorithm": "Dijkstra Path (Bidirectional)",
+        "complexity": "O((V + E) log V)",
+        "result": result
+    }
 
 
 @router.post("/dijkstra/all-paths", status_code=status.HTTP_200_OK)
@@ -537,18 +988,45 @@ def dijkstra_all_paths(request: DijkstraRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.dijkstra_all_paths_from(request.graph, request.start)
-        return {
-            "algorithm": "Dijkstra All Paths",
-            "complexity": "O((V + E) log V)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en Dijkstra all paths: {str(e)}"
-        )
+    result = _dijkstra_all_cache.get_or_compute(
+        (_edges_key(request), request.start),
+        lambda: algorithms_service.dijkstra_all_paths_from(request.graph, request.start),
+    )
+    return {
+        "algorithm": "Dijkstra All Paths",
+        "complexity": "O((V + E) log V)",
+        "result": result
+    }
+
+
+@router.post("/dijkstra/all-paths/stream", status_code=status.HTTP_200_OK)
+def dijkstra_all_paths_stream(request: DijkstraRequest) -> StreamingResponse:
+    """
+    Versión streaming de /dijkstra/all-paths: serializa camino por camino.
+
+    El pico de memoria baja de O(V²) (dict completo de caminos) a O(V)
+    por camino, lo que permite grafos grandes sin OOM.
+
+    Complejidad: O((V + E) log V) con heap
+
+    Args:
+        request: Grafo con pesos y nodo inicial
+
+    Returns:
+        JSON {"start_node": s, "paths": {destino: {path, distance}}}
+    """
+    def generate():
+        yield b'{"start_node":%d,"paths":{' % request.start
+        first = True
+        for end_node, info in algorithms_service.iter_dijkstra_paths(
+            request.graph, request.start
+        ):
+            prefix = b"" if first else b","
+            first = False
+            yield prefix + b'"%d":' % end_node + orjson.dumps(info)
+        yield b"}}"
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 # ==================== Bellman-Ford Endpoints ====================
@@ -571,18 +1049,12 @@ def execute_bellman_ford(request: BellmanFordRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si el grafo es inválido
     """
-    try:
-        result = algorithms_service.bellman_ford_shortest_paths(request.graph, request.start)
-        return {
-            "algorithm": "Bellman-Ford Shortest Paths",
-            "complexity": "O(V * E)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error ejecutando Bellman-Ford: {str(e)}"
-        )
+    result = algorithms_service.bellman_ford_shortest_paths(request.graph, request.start)
+    return {
+        "algorithm": "Bellman-Ford Shortest Paths",
+        "complexity": "O(V * E)",
+        "result": result
+    }
 
 
 @router.post("/bellman-ford/path", status_code=status.HTTP_200_OK)
@@ -603,18 +1075,12 @@ def bellman_ford_path(request: BellmanFordPathRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.bellman_ford_path(request.graph, request.start, request.end)
-        return {
-            "algorithm": "Bellman-Ford Path",
-            "complexity": "O(V * E)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en Bellman-Ford path: {str(e)}"
-        )
+    result = algorithms_service.bellman_ford_path(request.graph, request.start, request.end)
+    return {
+        "algorithm": "Bellman-Ford Path",
+        "complexity": "O(V * E)",
+        "result": result
+    }
 
 
 # ==================== Floyd-Warshall Endpoints ====================
@@ -635,18 +1101,56 @@ def execute_floyd_warshall(request: FloydWarshallRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si el grafo es inválido
     """
-    try:
-        result = algorithms_service.floyd_warshall_all_pairs(request.graph)
+    if request.format == "binary":
+        dist = algorithms_service.floyd_warshall_distance_matrix(request.graph)
         return {
             "algorithm": "Floyd-Warshall All Pairs",
             "complexity": "O(V³)",
-            "result": result
+            "format": "binary",
+            "shape": list(dist.shape),
+            "dtype": "float32",
+            "dist_b64": base64.b64encode(np.ascontiguousarray(dist).tobytes()).decode()
         }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error ejecutando Floyd-Warshall: {str(e)}"
-        )
+    result = _fw_cache.get_or_compute(
+        _edges_key(request),
+        lambda: algorithms_service.floyd_warshall_all_pairs(request.graph),
+    )
+    return {
+        "algorithm": "Floyd-Warshall All Pairs",
+        "complexity": "O(V³)",
+        "result": result
+    }
+
+
+@router.post("/floyd-warshall/stream", status_code=status.HTTP_200_OK)
+def floyd_warshall_stream(request: FloydWarshallRequest) -> StreamingResponse:
+    """
+    Versión streaming de /floyd-warshall: escribe la matriz fila por fila.
+
+    Evita materializar la matriz V×V como listas de floats Python antes
+    de serializar: cada fila sale directo del ndarray vía orjson
+    (OPT_SERIALIZE_NUMPY), con pico de memoria O(V) por fila.
+
+    Complejidad: O(V³)
+
+    Args:
+        request: Grafo con pesos
+
+    Returns:
+        JSON {"algorithm": ..., "rows": [[...], ...]} (inf -> null)
+    """
+    dist = algorithms_service.floyd_warshall_distance_matrix(request.graph)
+
+    def generate():
+        yield b'{"algorithm":"Floyd-Warshall All Pairs","complexity":"O(V\xc2\xb3)","rows":['
+        last = dist.shape[0] - 1
+        for i in range(dist.shape[0]):
+            # asarray quita la subclase memmap, que orjson no acepta
+            row = orjson.dumps(np.asarray(dist[i]), option=orjson.OPT_SERIALIZE_NUMPY)
+            yield row + (b"," if i != last else b"")
+        yield b"]}"
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 @router.post("/floyd-warshall/path", status_code=status.HTTP_200_OK)
@@ -665,18 +1169,27 @@ def floyd_warshall_path(request: FloydWarshallPathRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.floyd_warshall_path(request.graph, request.start, request.end)
-        return {
-            "algorithm": "Floyd-Warshall Path",
-            "complexity": "O(V³)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en Floyd-Warshall path: {str(e)}"
+    # Correr el O(V³) de todos los pares para extraer un solo camino es
+    # un desperdicio: con pesos no negativos un Dijkstra fuente-destino
+    # O((V+E) log V) da el mismo resultado; con negativos, Bellman-Ford
+    # O(V·E). El buffer _w ya está aplanado, así que el chequeo es un
+    # solo np.all en C.
+    if request._w.size == 0 or bool(np.all(request._w >= 0)):
+        result = algorithms_service.dijkstra_path(
+            request.graph, request.start, request.end
+        )
+        dispatched_as = "dijkstra"
+    else:
+        result = algorithms_service.bellman_ford_path(
+            request.graph, request.start, request.end
         )
+        dispatched_as = "bellman_ford"
+    return {
+        "algorithm": "Floyd-Warshall Path",
+        "complexity": "O((V + E) log V)" if dispatched_as == "dijkstra" else "O(V * E)",
+        "dispatched_as": dispatched_as,
+        "result": result
+    }
 
 
 # ==================== MST: Kruskal Endpoints ====================
@@ -699,18 +1212,18 @@ def execute_kruskal(request: KruskalRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si el grafo es inválido
     """
-    try:
-        result = algorithms_service.kruskal_mst(request.edges, request.num_vertices)
-        return {
-            "algorithm": "Kruskal MST",
-            "complexity": "O(E log E)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error ejecutando Kruskal: {str(e)}"
-        )
+    # SoA: tres arrays paralelos en lugar de tuplas boxed; el sort por
+    # peso queda en manos de np.argsort sobre float32
+    num_edges = len(request.edges)
+    u = np.fromiter((e[0] for e in request.edges), np.int32, count=num_edges)
+    v = np.fromiter((e[1] for e in request.edges), np.int32, count=num_edges)
+    w = np.fromiter((e[2] for e in request.edges), np.float32, count=num_edges)
+    result = algorithms_service.kruskal_mst_soa(u, v, w, request.num_vertices)
+    return {
+        "algorithm": "Kruskal MST",
+        "complexity": "O(E log E)",
+        "result": result
+    }
 
 
 @router.post("/mst/kruskal-graph", status_code=status.HTTP_200_OK)
@@ -729,18 +1242,12 @@ def kruskal_from_graph(request: KruskalGraphRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.kruskal_mst_from_graph(request.graph, request.num_vertices)
-        return {
-            "algorithm": "Kruskal MST from Graph",
-            "complexity": "O(E log E)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en Kruskal from graph: {str(e)}"
-        )
+    result = algorithms_service.kruskal_mst_from_graph(request.graph, request.num_vertices)
+    return {
+        "algorithm": "Kruskal MST from Graph",
+        "complexity": "O(E log E)",
+        "result": result
+    }
 
 
 # ==================== MST: Prim Endpoints ====================
@@ -763,22 +1270,16 @@ def execute_prim(request: PrimRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si el grafo es inválido
     """
-    try:
-        result = algorithms_service.prim_mst(
-            request.edges,
-            request.num_vertices,
-            request.start
-        )
-        return {
-            "algorithm": "Prim MST",
-            "complexity": "O(E log V)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error ejecutando Prim: {str(e)}"
-        )
+    result = algorithms_service.prim_mst(
+        request.edges,
+        request.num_vertices,
+        request.start
+    )
+    return {
+        "algorithm": "Prim MST",
+        "complexity": "O(E log V)",
+        "result": result
+    }
 
 
 @router.post("/mst/prim-graph", status_code=status.HTTP_200_OK)
@@ -797,22 +1298,16 @@ def prim_from_graph(request: PrimGraphRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.prim_mst_from_graph(
-            request.graph,
-            request.num_vertices,
-            request.start
-        )
-        return {
-            "algorithm": "Prim MST from Graph",
-            "complexity": "O(E log V)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en Prim from graph: {str(e)}"
-        )
+    result = algorithms_service.prim_mst_from_graph(
+        request.graph,
+        request.num_vertices,
+        request.start
+    )
+    return {
+        "algorithm": "Prim MST from Graph",
+        "complexity": "O(E log V)",
+        "result": result
+    }
 
 
 # ==================== Dynamic Programming: Knapsack Endpoints ====================
@@ -835,25 +1330,19 @@ def knapsack_01(request: Knapsack01Request) -> Dict[str, Any]:
     Raises:
         HTTPException: Si los datos son inválidos
     """
-    try:
-        if len(request.weights) != len(request.values):
-            raise ValueError("Pesos y valores deben tener la misma longitud")
+    if len(request.weights) != len(request.values):
+        raise ValueError("Pesos y valores deben tener la misma longitud")
 
-        result = algorithms_service.knapsack_01_problem(
-            request.weights,
-            request.values,
-            request.capacity
-        )
-        return {
-            "algorithm": "0/1 Knapsack",
-            "complexity": "O(n * W)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en Knapsack 0/1: {str(e)}"
-        )
+    result = algorithms_service.knapsack_01_problem(
+        request.weights,
+        request.values,
+        request.capacity
+    )
+    return {
+        "algorithm": "0/1 Knapsack",
+        "complexity": "O(n * W)",
+        "result": result
+    }
 
 
 @router.post("/dp-mochila/unbounded", status_code=status.HTTP_200_OK)
@@ -874,25 +1363,19 @@ def knapsack_unbounded(request: KnapsackUnboundedRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si los datos son inválidos
     """
-    try:
-        if len(request.weights) != len(request.values):
-            raise ValueError("Pesos y valores deben tener la misma longitud")
+    if len(request.weights) != len(request.values):
+        raise ValueError("Pesos y valores deben tener la misma longitud")
 
-        result = algorithms_service.knapsack_unbounded_problem(
-            request.weights,
-            request.values,
-            request.capacity
-        )
-        return {
-            "algorithm": "Unbounded Knapsack",
-            "complexity": "O(n * W)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en Unbounded Knapsack: {str(e)}"
-        )
+    result = algorithms_service.knapsack_unbounded_problem(
+        request.weights,
+        request.values,
+        request.capacity
+    )
+    return {
+        "algorithm": "Unbounded Knapsack",
+        "complexity": "O(n * W)",
+        "result": result
+    }
 
 
 @router.post("/dp-mochila/fractional", status_code=status.HTTP_200_OK)
@@ -913,25 +1396,19 @@ def knapsack_fractional(request: KnapsackFractionalRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si los datos son inválidos
     """
-    try:
-        if len(request.weights) != len(request.values):
-            raise ValueError("Pesos y valores deben tener la misma longitud")
+    if len(request.weights) != len(request.values):
+        raise ValueError("Pesos y valores deben tener la misma longitud")
 
-        result = algorithms_service.knapsack_fractional_problem(
-            request.weights,
-            request.values,
-            request.capacity
-        )
-        return {
-            "algorithm": "Fractional Knapsack",
-            "complexity": "O(n log n)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en Fractional Knapsack: {str(e)}"
-        )
+    result = algorithms_service.knapsack_fractional_problem(
+        request.weights,
+        request.values,
+        request.capacity
+    )
+    return {
+        "algorithm": "Fractional Knapsack",
+        "complexity": "O(n log n)",
+        "result": result
+    }
 
 
 # ==================== Dynamic Programming: Subset Sum Endpoint ====================
@@ -954,49 +1431,43 @@ def subset_sum(request: SubsetSumRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si los datos son inválidos
     """
-    try:
-        result = algorithms_service.subset_sum_problem(request.numbers, request.target)
-        return {
-            "algorithm": "Subset Sum",
-            "complexity": "O(n * target)",
-            "result": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error en Subset Sum: {str(e)}"
-        )
+    result = algorithms_service.subset_sum_problem(request.numbers, request.target)
+    return {
+        "algorithm": "Subset Sum",
+        "complexity": "O(n * target)",
+        "result": result
+    }
 
 
 # ==================== Informational Endpoints ====================
 
+# La tabla de complejidades es estática: se serializa una vez al importar
+# y el endpoint devuelve los bytes prehechos (mismo patrón que /schema)
+_COMPLEXITY_BYTES = orjson.dumps({
+    "message": "Información de complejidad de algoritmos",
+    "algorithms": dict(algorithms_service.get_algorithm_complexity_info())
+})
+
+
 @router.get("/info/complexity", status_code=status.HTTP_200_OK)
-def get_algorithms_complexity() -> Dict[str, Any]:
+def get_algorithms_complexity() -> Response:
     """
     Obtiene información sobre la complejidad de todos los algoritmos disponibles.
 
     Returns:
         Dict con complejidad temporal y espacial de cada algoritmo
     """
-    try:
-        complexity_info = algorithms_service.get_algorithm_complexity_info()
-        return {
-            "message": "Información de complejidad de algoritmos",
-            "algorithms": complexity_info
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error obteniendo información: {str(e)}"
-        )
+    return Response(content=_COMPLEXITY_BYTES, media_type="application/json")
 
 
 @router.post("/compare/shortest-paths", status_code=status.HTTP_200_OK)
-def compare_shortest_paths(request: DijkstraPathRequest) -> Dict[str, Any]:
+async def compare_shortest_paths(request: DijkstraPathRequest) -> Dict[str, Any]:
     """
     Compara los resultados de diferentes algoritmos de camino más corto.
 
     Ejecuta Dijkstra, Bellman-Ford y Floyd-Warshall sobre el mismo problema.
+    Los tres corren concurrentemente en el threadpool: el grafo se parsea
+    una sola vez y el tiempo total tiende a max(T) en lugar de la suma.
 
     Args:
         request: Grafo, nodo inicio y nodo final
@@ -1007,18 +1478,24 @@ def compare_shortest_paths(request: DijkstraPathRequest) -> Dict[str, Any]:
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        result = algorithms_service.compare_shortest_path_algorithms(
-            request.graph,
-            request.start,
-            request.end
-        )
-        return {
-            "message": "Comparación de algoritmos de camino más corto",
-            "comparison": result
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error en comparación: {str(e)}"
-        )
+    dijkstra_res, bellman_res, fw_res = await asyncio.gather(
+        asyncio.to_thread(
+            algorithms_service.dijkstra_path, request.graph, request.start, request.end
+        ),
+        asyncio.to_thread(
+            algorithms_service.bellman_ford_path, request.graph, request.start, request.end
+        ),
+        asyncio.to_thread(
+            algorithms_service.floyd_warshall_path, request.graph, request.start, request.end
+        ),
+    )
+    result = {
+        'dijkstra': dijkstra_res,
+        'bellman_ford': bellman_res,
+        'floyd_warshall': fw_res,
+        'comparison': 'Todos los algoritmos deberían dar el mismo resultado'
+    }
+    return {
+        "message": "Comparación de algoritmos de camino más corto",
+        "comparison": result
+    }
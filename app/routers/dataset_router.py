@@ -1,19 +1,175 @@
 """
 Dataset Router - Endpoints para manejo de datasets
 """
-from fastapi import APIRouter, File, UploadFile, Depends, HTTPException, status
+import asyncio
+import mmap
+
+import orjson
+import pandas as pd
+from fastapi import APIRouter, File, Request, Response, UploadFile, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, List
 from app.core.database import get_db
 from app.services.dataset_service import dataset_service
 
 router = APIRouter(prefix="/dataset", tags=["Dataset"])
 
+# Tamaño de chunk para leer uploads: lo bastante grande para amortizar
+# los await, lo bastante chico para no duplicar el archivo en RAM
+_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def _mmap_blocks(raw) -> List[bytes]:
+    """
+    Corta un upload derramado a disco en bloques alineados a filas vía mmap.
+
+    En lugar de copiar el archivo del tempfile a bytes de Python, el
+    cuerpo se mapea read-only y los bloques son memoryviews sobre el
+    mapeo: los bytes llegan por page faults recién cuando el parser los
+    toca, sin duplicar el archivo en RSS.
+    """
+    raw.flush()
+    mapped = mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+
+    blocks: List[bytes] = []
+    pos = 0
+    size = len(mapped)
+    while pos < size:
+        end = min(pos + _UPLOAD_CHUNK_SIZE, size)
+        if end < size:
+            cut = mapped.rfind(b"\n", pos, end)
+            if cut >= pos:
+                end = cut + 1
+            else:
+                # Fila más larga que el chunk: extender hasta el próximo '\n'
+                nl = mapped.find(b"\n", end)
+                end = size if nl == -1 else nl + 1
+        blocks.append(view[pos:end])
+        pos = end
+    return blocks
+
+
+async def _read_csv_blocks(file: UploadFile) -> List[bytes]:
+    """
+    Lee el upload en chunks de 8 MiB cortados en el último '\n'.
+
+    Cada bloque contiene solo filas completas, así el servicio puede
+    parsearlos en paralelo; la cola parcial de cada chunk se antepone al
+    siguiente. Evita materializar todo el archivo en un solo bytes antes
+    de empezar a parsear. Si Starlette ya derramó el upload a disco
+    (SpooledTemporaryFile rodado), el archivo se mapea con mmap en vez
+    de copiarse chunk a chunk.
+    """
+    if getattr(file.file, "_rolled", False):
+        return await asyncio.to_thread(_mmap_blocks, file.file)
+
+    blocks: List[bytes] = []
+    tail = b""
+    while True:
+        chunk = await file.read(_UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        data = tail + chunk
+        cut = data.rfind(b"\n")
+        if cut == -1:
+            tail = data
+            continue
+        blocks.append(data[:cut + 1])
+        tail = data[cut + 1:]
+    if tail:
+        blocks.append(tail)
+    return blocks
+
+
+def _process_upload(
+    blocks: List[bytes], normalize: bool, use_arrow: bool, db: Session
+) -> Dict[str, Any]:
+    """
+    Pipeline síncrono parse → validate → normalize → stats → save.
+
+    Corre en un hilo (asyncio.to_thread) para que el event loop siga
+    atendiendo otras requests mientras pandas mastica el archivo.
+    """
+    df = dataset_service.parse_csv_blocks(blocks, use_arrow=use_arrow)
+
+    validation = dataset_service.validate_schema(df)
+    if not validation["is_valid"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Esquema inválido. Columnas faltantes: {validation['missing_columns']}"
+        )
+
+    if normalize:
+        df = dataset_service.normalize_data(df)
+
+    stats = dataset_service.get_dataset_stats(df)
+    save_result = dataset_service.save_to_db(df, db)
+
+    return {
+        "message": "Dataset cargado exitosamente",
+        "validation": validation,
+        "statistics": stats,
+        "save_result": save_result
+    }
+
+
+_ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def _validate_and_normalize(blocks: List[bytes], use_arrow: bool):
+    """Parse + validación + normalización compartidos por ambos formatos."""
+    df = dataset_service.parse_csv_blocks(blocks, use_arrow=use_arrow)
+
+    # Validar que el CSV no esté vacío
+    if len(df) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El archivo CSV está vacío"
+        )
+
+    # Validar esquema
+    validation = dataset_service.validate_schema(df)
+    if not validation["is_valid"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Esquema inválido",
+                "columnas_requeridas": ['fecha', 'tipo', 'categoria', 'monto', 'usuario'],
+                "columnas_faltantes": validation['missing_columns'],
+                "columnas_detectadas": validation['present_columns'],
+                "sugerencia": "Verifica que los nombres de las columnas coincidan exactamente (en minúsculas)"
+            }
+        )
+
+    return df, dataset_service.normalize_data(df), validation
+
+
+def _process_normalize(blocks: List[bytes], use_arrow: bool) -> Dict[str, Any]:
+    """Pipeline síncrono de /normalize; ver _process_upload."""
+    df, df_normalized, validation = _validate_and_normalize(blocks, use_arrow)
+
+    # Calcular estadísticas
+    stats_before = dataset_service.get_dataset_stats(df)
+    stats_after = dataset_service.get_dataset_stats(df_normalized)
+
+    return {
+        "message": "Dataset normalizado exitosamente",
+        "rows_before": len(df),
+        "rows_after": len(df_normalized),
+        "rows_removed": len(df) - len(df_normalized),
+        "validation": validation,
+        "statistics_before": stats_before,
+        "statistics_after": stats_after
+    }
+
 
 @router.post("/upload", status_code=status.HTTP_201_CREATED)
 async def upload_dataset(
     file: UploadFile = File(...),
     normalize: bool = True,
+    use_arrow: bool = True,
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
@@ -22,6 +178,7 @@ async def upload_dataset(
     Args:
         file: Archivo CSV
         normalize: Si se debe normalizar los datos
+        use_arrow: Usar el parser CSV de pyarrow si está disponible
         db: Sesión de base de datos
 
     Returns:
@@ -33,81 +190,76 @@ async def upload_dataset(
             detail="Solo se permiten archivos CSV"
         )
 
-    try:
-        content = await file.read()
-        df = dataset_service.parse_csv(content)
-
-        validation = dataset_service.validate_schema(df)
-        if not validation["is_valid"]:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Esquema inválido. Columnas faltantes: {validation['missing_columns']}"
-            )
-
-        if normalize:
-            df = dataset_service.normalize_data(df)
-
-        stats = dataset_service.get_dataset_stats(df)
-        save_result = dataset_service.save_to_db(df, db)
+    blocks = await _read_csv_blocks(file)
+    return await asyncio.to_thread(
+        _process_upload, blocks, normalize, use_arrow, db
+    )
 
-        return {
-            "message": "Dataset cargado exitosamente",
-            "validation": validation,
-            "statistics": stats,
-            "save_result": save_result
-        }
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error procesando dataset: {str(e)}"
-        )
+# Payload constante de /schema serializado una vez al importar, como los
+# payloads estáticos de main.py: el endpoint devuelve los bytes prehechos
+_SCHEMA_BYTES = orjson.dumps({
+    "required_columns": {
+        "fecha": "date (YYYY-MM-DD)",
+        "tipo": "string (ingreso/egreso)",
+        "categoria": "string",
+        "monto": "float",
+        "usuario": "string"
+    },
+    "optional_columns": {
+        "subcategoria": "string",
+        "descripcion": "string",
+        "metodo_pago": "string"
+    },
+    "example": {
+        "fecha": "2024-01-15",
+        "tipo": "egreso",
+        "categoria": "Comida",
+        "subcategoria": "Restaurante",
+        "descripcion": "Almuerzo",
+        "metodo_pago": "Tarjeta",
+        "monto": 25.50,
+        "usuario": "user123"
+    }
+})
 
 
 @router.get("/schema")
-def get_schema() -> Dict[str, Any]:
+def get_schema() -> Response:
     """
     Obtiene el esquema esperado del dataset.
 
     Returns:
         Esquema del dataset
     """
-    return {
-        "required_columns": {
-            "fecha": "date (YYYY-MM-DD)",
-            "tipo": "string (ingreso/egreso)",
-            "categoria": "string",
-            "monto": "float",
-            "usuario": "string"
-        },
-        "optional_columns": {
-            "subcategoria": "string",
-            "descripcion": "string",
-            "metodo_pago": "string"
-        },
-        "example": {
-            "fecha": "2024-01-15",
-            "tipo": "egreso",
-            "categoria": "Comida",
-            "subcategoria": "Restaurante",
-            "descripcion": "Almuerzo",
-            "metodo_pago": "Tarjeta",
-            "monto": 25.50,
-            "usuario": "user123"
-        }
-    }
+    return Response(
+        content=_SCHEMA_BYTES,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=30"}
+    )
 
 
 @router.post("/normalize")
-async def normalize_dataset(file: UploadFile = File(...)) -> Dict[str, Any]:
+async def normalize_dataset(
+    request: Request,
+    file: UploadFile = File(...),
+    use_arrow: bool = True
+):
     """
     Normaliza un dataset sin guardarlo.
 
+    Con `Accept: application/vnd.apache.arrow.stream` (y pyarrow
+    instalado) la respuesta es el dataset normalizado como stream Arrow
+    IPC — columnas binarias en lugar de texto JSON; en caso contrario
+    se mantiene la respuesta JSON con estadísticas.
+
     Args:
+        request: Request entrante (para negociar el formato con Accept)
         file: Archivo CSV
+        use_arrow: Usar el parser CSV de pyarrow si está disponible
 
     Returns:
-        Dataset normalizado y estadísticas
+        Dataset normalizado y estadísticas (JSON) o stream Arrow IPC
     """
     # Validar tipo de archivo
     if not file.filename.endswith('.csv'):
@@ -116,51 +268,24 @@ async def normalize_dataset(file: UploadFile = File(...)) -> Dict[str, Any]:
             detail="Solo se permiten archivos CSV"
         )
 
+    wants_arrow = (
+        _ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", "")
+        and dataset_service.has_arrow()
+    )
+
     try:
-        # Leer y parsear CSV
-        content = await file.read()
-        df = dataset_service.parse_csv(content)
-
-        # Validar que el CSV no esté vacío
-        if len(df) == 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="El archivo CSV está vacío"
+        # Leer y parsear CSV en bloques alineados a filas
+        blocks = await _read_csv_blocks(file)
+        if wants_arrow:
+            _, df_normalized, _ = await asyncio.to_thread(
+                _validate_and_normalize, blocks, use_arrow
             )
-
-        # Validar esquema
-        validation = dataset_service.validate_schema(df)
-        if not validation["is_valid"]:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "error": "Esquema inválido",
-                    "columnas_requeridas": ['fecha', 'tipo', 'categoria', 'monto', 'usuario'],
-                    "columnas_faltantes": validation['missing_columns'],
-                    "columnas_detectadas": validation['present_columns'],
-                    "sugerencia": "Verifica que los nombres de las columnas coincidan exactamente (en minúsculas)"
-                }
+            return StreamingResponse(
+                dataset_service.iter_arrow_stream(df_normalized),
+                media_type=_ARROW_STREAM_MEDIA_TYPE
             )
+        return await asyncio.to_thread(_process_normalize, blocks, use_arrow)
 
-        # Normalizar datos
-        df_normalized = dataset_service.normalize_data(df)
-
-        # Calcular estadísticas
-        stats_before = dataset_service.get_dataset_stats(df)
-        stats_after = dataset_service.get_dataset_stats(df_normalized)
-
-        return {
-            "message": "Dataset normalizado exitosamente",
-            "rows_before": len(df),
-            "rows_after": len(df_normalized),
-            "rows_removed": len(df) - len(df_normalized),
-            "validation": validation,
-            "statistics_before": stats_before,
-            "statistics_after": stats_after
-        }
-
-    except HTTPException:
-        raise
     except pd.errors.EmptyDataError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -171,8 +296,3 @@ async def normalize_dataset(file: UploadFile = File(...)) -> Dict[str, Any]:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error al parsear CSV: {str(e)}"
         )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error normalizando dataset: {str(e)}"
-        )
@@ -1,15 +1,109 @@
 """
 Graph Router - Endpoints para construcción y estadísticas de grafos
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import hashlib
+import threading
+
+from fastapi import APIRouter, Depends, Header, Response, status
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from typing import Dict, Any, Literal
+from typing import Dict, Any, Literal, Optional, Tuple
 from pydantic import BaseModel, Field
 from app.core.database import get_db
 from app.services.graph_service import graph_service
 
 router = APIRouter(prefix="/graphs", tags=["Graphs"])
 
+# Cache de grafos construidos, keyed por (tipo, versión del dataset).
+# Mientras las transacciones no cambien, repetir /graphs/* es un lookup
+# en lugar de releer toda la tabla y rematerializar el grafo.
+_graph_cache: Dict[Tuple[str, Tuple], Any] = {}
+_GRAPH_CACHE_MAX = 8
+_graph_cache_lock = threading.Lock()
+
+# Resumen de /summary/overview memoizado por versión del dataset (una
+# sola entrada); los dashboards lo piden en cada carga de página
+_summary_cache: Dict[Tuple, Dict[str, Any]] = {}
+
+# Época de mutaciones: (count, max id) no se mueve con un update
+# in-place, así que cada invalidación también suma aquí y el contador
+# entra en el token de versión (y por lo tanto en el ETag)
+_dataset_epoch = 0
+
+# Despacho por tipo de grafo: un lookup en vez de repetir la cascada
+# if/elif (y su descripción) en cada endpoint
+_BUILDERS = {
+    "GT": graph_service.build_gt_from_db,
+    "GC": graph_service.build_gc_from_db,
+    "GUC": graph_service.build_guc_from_db,
+}
+
+_DESCRIPTIONS = {
+    "GT": "Grafo de Transacciones",
+    "GC": "Grafo de Categorías",
+    "GUC": "Grafo Usuario-Categoría",
+}
+
+
+def _dataset_version(db: Session) -> Tuple:
+    """
+    Token barato de versión del dataset: (count, max id, época) de
+    transactions.
+
+    Dos lecturas agregadas sobre la PK más el contador de mutaciones del
+    proceso; si cambia cualquiera, el grafo cacheado se considera
+    inválido.
+    """
+    row = db.execute(
+        text("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM transactions")
+    ).one()
+    return (int(row[0]), int(row[1]), _dataset_epoch)
+
+
+def _build_graph_cached(graph_type: str, db: Session) -> Any:
+    """
+    Construye (o recupera) el grafo del tipo pedido para la versión
+    actual del dataset.
+    """
+    version = _dataset_version(db)
+    key = (graph_type, version)
+    with _graph_cache_lock:
+        if key in _graph_cache:
+            return _graph_cache[key]
+    graph = _BUILDERS[graph_type](db)
+    with _graph_cache_lock:
+        if len(_graph_cache) >= _GRAPH_CACHE_MAX:
+            _graph_cache.pop(next(iter(_graph_cache)))
+        _graph_cache[key] = graph
+    return graph
+
+
+def invalidate_graph_cache() -> None:
+    """Descarta los grafos y resúmenes cacheados; llamado al mutar
+    transacciones."""
+    global _dataset_epoch
+    with _graph_cache_lock:
+        _graph_cache.clear()
+        _summary_cache.clear()
+        _dataset_epoch += 1
+
+
+def _dataset_etag(db: Session) -> str:
+    """
+    ETag derivado del token de versión del dataset.
+
+    Los dashboards que hacen polling pueden mandar If-None-Match y
+    recibir 304 sin que el servidor reconstruya ni serialice nada. La
+    época de mutaciones hace que un update in-place (que no mueve ni el
+    count ni el max id) también cambie el ETag.
+    """
+    count, max_id, epoch = _dataset_version(db)
+    digest = hashlib.blake2b(
+        f"{count}:{max_id}:{epoch}".encode(), digest_size=8
+    ).hexdigest()
+    return f'"{digest}"'
+
 
 # ==================== Pydantic Models ====================
 
@@ -41,7 +135,7 @@ class TemporalGraphRequest(BaseModel):
 # ==================== Endpoints ====================
 
 @router.post("/build", status_code=status.HTTP_201_CREATED)
-def build_graph(
+async def build_graph(
     request: GraphBuildRequest,
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
@@ -63,54 +157,46 @@ def build_graph(
     Raises:
         HTTPException: Si ocurre un error al construir el grafo
     """
-    try:
-        graph_type = request.graph_type.upper()
-
-        if graph_type == "GT":
-            graph = graph_service.build_gt_from_db(db)
-            description = "Grafo de Transacciones"
-        elif graph_type == "GC":
-            graph = graph_service.build_gc_from_db(db)
-            description = "Grafo de Categorías"
-        elif graph_type == "GUC":
-            graph = graph_service.build_guc_from_db(db)
-            description = "Grafo Usuario-Categoría"
-        else:
-            raise ValueError(f"Tipo de grafo inválido: {graph_type}")
-
-        stats = graph_service.get_graph_statistics(graph)
-
-        return {
-            "message": f"{description} construido exitosamente",
-            "graph_type": graph_type,
-            "description": description,
-            "graph": graph,
-            "statistics": stats
-        }
+    graph_type = request.graph_type.upper()
+
+    if graph_type not in _BUILDERS:
+        raise ValueError(f"Tipo de grafo inválido: {graph_type}")
+    description = _DESCRIPTIONS[graph_type]
 
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error construyendo grafo: {str(e)}"
-        )
+    # La construcción recorre todas las transacciones: va a un hilo
+    # para no bloquear el event loop; con dataset sin cambios sale
+    # del cache versionado
+    graph = await asyncio.to_thread(_build_graph_cached, graph_type, db)
+
+    stats = await asyncio.to_thread(graph_service.get_graph_statistics, graph)
+
+    return {
+        "message": f"{description} construido exitosamente",
+        "graph_type": graph_type,
+        "description": description,
+        "graph": graph,
+        "statistics": stats
+    }
 
 
 @router.get("/{graph_type}", status_code=status.HTTP_200_OK)
 def get_graph(
     graph_type: Literal["GT", "GC", "GUC"],
-    db: Session = Depends(get_db)
+    response: Response,
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
 ) -> Dict[str, Any]:
     """
     Obtiene un grafo específico del tipo indicado.
 
+    Responde 304 si el If-None-Match del cliente coincide con la
+    versión actual del dataset.
+
     Args:
         graph_type: Tipo de grafo (GT, GC, GUC)
+        response: Response saliente (para el header ETag)
         db: Sesión de base de datos
+        if_none_match: ETag que el cliente ya tiene
 
     Returns:
         Grafo del tipo solicitado
@@ -118,48 +204,41 @@ def get_graph(
     Raises:
         HTTPException: Si el tipo de grafo es inválido o ocurre error
     """
-    try:
-        graph_type = graph_type.upper()
-
-        if graph_type == "GT":
-            graph = graph_service.build_gt_from_db(db)
-            description = "Grafo de Transacciones"
-        elif graph_type == "GC":
-            graph = graph_service.build_gc_from_db(db)
-            description = "Grafo de Categorías"
-        elif graph_type == "GUC":
-            graph = graph_service.build_guc_from_db(db)
-            description = "Grafo Usuario-Categoría"
-        else:
-            raise ValueError(f"Tipo de grafo inválido: {graph_type}")
-
-        return {
-            "graph_type": graph_type,
-            "description": description,
-            "graph": graph
-        }
+    graph_type = graph_type.upper()
+
+    etag = _dataset_etag(db)
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    response.headers["ETag"] = etag
+
+    if graph_type not in _BUILDERS:
+        raise ValueError(f"Tipo de grafo inválido: {graph_type}")
+    description = _DESCRIPTIONS[graph_type]
+    graph = _build_graph_cached(graph_type, db)
 
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error obteniendo grafo: {str(e)}"
-        )
+    return {
+        "graph_type": graph_type,
+        "description": description,
+        "graph": graph
+    }
 
 
 @router.get("/stats/all", status_code=status.HTTP_200_OK)
 def get_all_graphs_stats(
-    db: Session = Depends(get_db)
+    response: Response,
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
 ) -> Dict[str, Any]:
     """
     Obtiene las estadísticas de todos los tipos de grafos disponibles.
 
+    Responde 304 si el If-None-Match del cliente coincide con la
+    versión actual del dataset.
+
     Args:
+        response: Response saliente (para el header ETag)
         db: Sesión de base de datos
+        if_none_match: ETag que el cliente ya tiene
 
     Returns:
         Estadísticas comparativas de GT, GC y GUC
@@ -167,26 +246,26 @@ def get_all_graphs_stats(
     Raises:
         HTTPException: Si ocurre error al calcular estadísticas
     """
-    try:
-        stats = graph_service.compare_graph_types(db)
+    etag = _dataset_etag(db)
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    response.headers["ETag"] = etag
 
-        return {
-            "message": "Estadísticas de todos los grafos",
-            "statistics": stats,
-            "timestamp": None  # Podría agregarse timestamp si es necesario
-        }
+    stats = graph_service.compare_graph_types(db)
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error calculando estadísticas: {str(e)}"
-        )
+    return {
+        "message": "Estadísticas de todos los grafos",
+        "statistics": stats,
+        "timestamp": None  # Podría agregarse timestamp si es necesario
+    }
 
 
 @router.get("/stats/{graph_type}", status_code=status.HTTP_200_OK)
-def get_graph_stats(
+async def get_graph_stats(
     graph_type: Literal["GT", "GC", "GUC"],
-    db: Session = Depends(get_db)
+    response: Response,
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
 ) -> Dict[str, Any]:
     """
     Obtiene las estadísticas de un grafo específico.
@@ -208,38 +287,31 @@ def get_graph_stats(
     Raises:
         HTTPException: Si el tipo de grafo es inválido o ocurre error
     """
-    try:
-        graph_type = graph_type.upper()
-
-        if graph_type == "GT":
-            stats = graph_service.get_gt_statistics(db)
-        elif graph_type == "GC":
-            stats = graph_service.get_gc_statistics(db)
-        elif graph_type == "GUC":
-            stats = graph_service.get_guc_statistics(db)
-        else:
-            raise ValueError(f"Tipo de grafo inválido: {graph_type}")
-
-        return {
-            "graph_type": graph_type,
-            "statistics": stats
-        }
+    graph_type = graph_type.upper()
+
+    if graph_type not in _BUILDERS:
+        raise ValueError(f"Tipo de grafo inválido: {graph_type}")
 
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error calculando estadísticas: {str(e)}"
-        )
+    etag = _dataset_etag(db)
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    response.headers["ETag"] = etag
+
+    graph = await asyncio.to_thread(_build_graph_cached, graph_type, db)
+    stats = await asyncio.to_thread(graph_service.get_graph_statistics, graph)
+    stats['graph_type'] = graph_type
+
+    return {
+        "graph_type": graph_type,
+        "statistics": stats
+    }
 
 
 @router.get("/summary/overview", status_code=status.HTTP_200_OK)
 def get_graphs_summary(
-    db: Session = Depends(get_db)
+    response: Response,
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
 ) -> Dict[str, Any]:
     """
     Obtiene un resumen general de los grafos disponibles.
@@ -256,19 +328,27 @@ def get_graphs_summary(
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
+    version = _dataset_version(db)
+    etag = _dataset_etag(db)
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    response.headers["ETag"] = etag
+    # 30s de cache del lado del cliente: suficiente frescura para un
+    # dashboard y evita la mayoría de los round-trips del polling
+    response.headers["Cache-Control"] = "public, max-age=30"
+
+    with _graph_cache_lock:
+        summary = _summary_cache.get(version)
+    if summary is None:
         summary = graph_service.get_graph_summary(db)
+        with _graph_cache_lock:
+            _summary_cache.clear()
+            _summary_cache[version] = summary
 
-        return {
-            "message": "Resumen de grafos disponibles",
-            "summary": summary
-        }
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error obteniendo resumen: {str(e)}"
-        )
+    return {
+        "message": "Resumen de grafos disponibles",
+        "summary": summary
+    }
 
 
 @router.post("/temporal/build", status_code=status.HTTP_201_CREATED)
@@ -292,25 +372,18 @@ def build_temporal_graph(
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        graph = graph_service.build_temporal_graph_from_db(
-            db,
-            time_window_days=request.time_window_days
-        )
-        stats = graph_service.get_graph_statistics(graph)
-
-        return {
-            "message": "Grafo temporal construido exitosamente",
-            "time_window_days": request.time_window_days,
-            "graph": graph,
-            "statistics": stats
-        }
+    graph = graph_service.build_temporal_graph_from_db(
+        db,
+        time_window_days=request.time_window_days
+    )
+    stats = graph_service.get_graph_statistics(graph)
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error construyendo grafo temporal: {str(e)}"
-        )
+    return {
+        "message": "Grafo temporal construido exitosamente",
+        "time_window_days": request.time_window_days,
+        "graph": graph,
+        "statistics": stats
+    }
 
 
 @router.post("/weighted-categories/build", status_code=status.HTTP_201_CREATED)
@@ -332,18 +405,11 @@ def build_weighted_category_graph(
     Raises:
         HTTPException: Si ocurre error
     """
-    try:
-        graph = graph_service.build_weighted_category_graph_from_db(db)
-        stats = graph_service.get_graph_statistics(graph)
-
-        return {
-            "message": "Grafo de categorías ponderado construido exitosamente",
-            "graph": graph,
-            "statistics": stats
-        }
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error construyendo grafo ponderado: {str(e)}"
-        )
+    graph = graph_service.build_weighted_category_graph_from_db(db)
+    stats = graph_service.get_graph_statistics(graph)
+
+    return {
+        "message": "Grafo de categorías ponderado construido exitosamente",
+        "graph": graph,
+        "statistics": stats
+    }
@@ -1,12 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
-from app.schemas.transaction import Transaction, TransactionCreate, TransactionUpdate, TransactionPaginatedResponse
+from app.models.transaction import Transaction as TransactionModel
+from app.routers.graph_router import invalidate_graph_cache
+from app.schemas.transaction import Transaction, TransactionCreate, TransactionUpdate, transaction_list_adapter
 from app.services.transaction_service import transaction_service
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
+# Por encima de este limit la página se sirve con cursor server-side y
+# respuesta streaming, sin construir objetos ORM ni la lista completa
+_STREAM_THRESHOLD = 500
+_STREAM_CHUNK = 5000
+
+
+def _stream_transactions_page(
+    db: Session,
+    usuario: Optional[str],
+    skip: int,
+    limit: int,
+    total: int,
+    total_is_estimate: bool,
+):
+    """Genera la respuesta paginada como JSON por fragmentos.
+
+    Las filas salen de un select Core con yield_per (cursor server-side
+    en Postgres): cada lote se serializa con orjson y se escribe al
+    socket antes de leer el siguiente, así el pico de memoria queda
+    acotado al lote y no al limit pedido."""
+    stmt = select(
+        TransactionModel.fecha,
+        TransactionModel.tipo,
+        TransactionModel.categoria,
+        TransactionModel.subcategoria,
+        TransactionModel.descripcion,
+        TransactionModel.metodo_pago,
+        TransactionModel.monto,
+        TransactionModel.usuario,
+        TransactionModel.id,
+        TransactionModel.created_at,
+    )
+    if usuario:
+        stmt = stmt.where(TransactionModel.usuario == usuario)
+    stmt = stmt.offset(skip).limit(limit).execution_options(
+        yield_per=_STREAM_CHUNK
+    )
+
+    yield b'{"data":['
+    first = True
+    for row in db.execute(stmt):
+        payload = orjson.dumps({
+            "fecha": row.fecha,
+            "tipo": row.tipo,
+            "categoria": row.categoria,
+            "subcategoria": row.subcategoria,
+            "descripcion": row.descripcion,
+            "metodo_pago": row.metodo_pago,
+            "monto": float(row.monto),
+            "usuario": row.usuario,
+            "id": row.id,
+            "created_at": row.created_at,
+        })
+        yield payload if first else b"," + payload
+        first = False
+    yield (
+        b'],"total":%d,"total_is_estimate":%s,"skip":%d,"limit":%d}'
+        % (total, b"true" if total_is_estimate else b"false", skip, limit)
+    )
+
 
 @router.post("/", response_model=Transaction, status_code=status.HTTP_201_CREATED)
 def create_transaction(
@@ -14,30 +79,52 @@ def create_transaction(
     db: Session = Depends(get_db)
 ):
     """Create a new transaction."""
-    return transaction_service.create_transaction(db=db, transaction=transaction)
+    result = transaction_service.create_transaction(db=db, transaction=transaction)
+    invalidate_graph_cache()
+    return result
 
 
-@router.get("/", response_model=TransactionPaginatedResponse)
+@router.get("/")
 def get_transactions(
     usuario: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=10000),
     db: Session = Depends(get_db)
 ):
-    """Get all transactions with pagination metadata, optionally filtered by user."""
+    """Get all transactions with pagination metadata, optionally filtered by user.
+
+    The page is validated and serialized in one TypeAdapter pass instead
+    of going through response_model's per-row validation and
+    jsonable_encoder; past _STREAM_THRESHOLD rows the page streams from
+    a server-side cursor instead."""
+    if limit > _STREAM_THRESHOLD:
+        if usuario:
+            total = transaction_service.count_user_transactions(db=db, usuario=usuario)
+            total_is_estimate = False
+        else:
+            total, total_is_estimate = transaction_service.estimate_all_transactions(db=db)
+        return StreamingResponse(
+            _stream_transactions_page(db, usuario, skip, limit, total, total_is_estimate),
+            media_type="application/json"
+        )
+
     if usuario:
         data = transaction_service.get_user_transactions(db=db, usuario=usuario, skip=skip, limit=limit)
+        # Filtrado: COUNT index-only sobre ix_tx_usuario_fecha
         total = transaction_service.count_user_transactions(db=db, usuario=usuario)
+        total_is_estimate = False
     else:
         data = transaction_service.get_all_transactions(db=db, skip=skip, limit=limit)
-        total = transaction_service.count_all_transactions(db=db)
+        total, total_is_estimate = transaction_service.estimate_all_transactions(db=db)
 
-    return TransactionPaginatedResponse(
-        data=data,
-        total=total,
-        skip=skip,
-        limit=limit
-    )
+    page = transaction_list_adapter.validate_python(data, from_attributes=True)
+    return ORJSONResponse({
+        "data": transaction_list_adapter.dump_python(page, mode="json"),
+        "total": total,
+        "total_is_estimate": total_is_estimate,
+        "skip": skip,
+        "limit": limit
+    })
 
 
 @router.get("/{transaction_id}", response_model=Transaction)
@@ -72,6 +159,7 @@ def update_transaction(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Transaction not found"
         )
+    invalidate_graph_cache()
     return transaction
 
 
@@ -87,4 +175,5 @@ def delete_transaction(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Transaction not found"
         )
+    invalidate_graph_cache()
     return None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import Optional, List
 from datetime import datetime, date
 
@@ -33,8 +33,7 @@ class TransactionInDB(TransactionBase):
     id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Transaction(TransactionInDB):
@@ -45,8 +44,13 @@ class TransactionPaginatedResponse(BaseModel):
     """Paginated response for transactions."""
     data: List[Transaction]
     total: int
+    total_is_estimate: bool = False
     skip: int
     limit: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Adapter a nivel de módulo: valida la página completa de filas ORM en
+# una sola entrada a pydantic-core en lugar de un modelo por fila
+transaction_list_adapter = TypeAdapter(List[Transaction])
@@ -2,22 +2,90 @@
 Algorithms Service - Envoltura de todos los algoritmos de grafos
 Incluye: BFS, DFS, Dijkstra, Bellman-Ford, Floyd-Warshall, MST, DP
 """
+import hashlib
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 
 # Importar funciones de los algoritmos
-from app.utils.bfs import bfs, bfs_shortest_path, bfs_levels
+from app.utils.bfs import bfs, bfs_csr, bfs_multi_source, bfs_shortest_path, bfs_levels
 from app.utils.dfs import dfs, dfs_recursive, dfs_paths, detect_cycle_dfs, topological_sort_dfs
-from app.utils.dijkstra import dijkstra, dijkstra_path, dijkstra_all_paths
+from app.utils.dijkstra import (
+    dijkstra, dijkstra_csr, dijkstra_path, dijkstra_all_paths,
+    dijkstra_bidirectional, iter_dijkstra_all_paths
+)
 from app.utils.bellman_ford import bellman_ford, bellman_ford_path
-from app.utils.floyd_warshall import floyd_warshall, floyd_warshall_with_paths
-from app.utils.mst_kruskal import kruskal, kruskal_from_graph
+from app.utils.delta_stepping import delta_stepping
+from app.utils.floyd_warshall import (
+    floyd_warshall, floyd_warshall_arrays, floyd_warshall_numpy,
+    floyd_warshall_with_paths, reconstruct_path_fw
+)
+from app.utils.mst_kruskal import kruskal, kruskal_from_graph, kruskal_soa
 from app.utils.mst_prim import prim, prim
 from app.utils.dp_mochila import (
     knapsack_01, knapsack_unbounded, knapsack_fractional, subset_sum
 )
 
 
+# Tabla estática de complejidades, construida una vez al importar: el
+# endpoint de metadata la devuelve tal cual en cada request, así que no
+# tiene sentido realojar los mismos dicts por llamada. MappingProxyType
+# la deja de solo lectura y compartible entre hebras.
+_COMPLEXITY_INFO = MappingProxyType({
+    'bfs': {'time': 'O(V + E)', 'space': 'O(V)'},
+    'dfs': {'time': 'O(V + E)', 'space': 'O(V)'},
+    'dijkstra': {'time': 'O((V + E) log V)', 'space': 'O(V)'},
+    'delta_stepping': {'time': 'O((V + E) log V), mejores constantes', 'space': 'O(V)'},
+    'bellman_ford': {'time': 'O(V * E)', 'space': 'O(V)'},
+    'floyd_warshall': {'time': 'O(V³)', 'space': 'O(V²)'},
+    'kruskal_mst': {'time': 'O(E log E)', 'space': 'O(V + E)'},
+    'prim_mst': {'time': 'O(E log V)', 'space': 'O(V)'},
+    'knapsack_01': {'time': 'O(n * W)', 'space': 'O(n * W)'},
+    'knapsack_unbounded': {'time': 'O(n * W)', 'space': 'O(W)'},
+    'knapsack_fractional': {'time': 'O(n log n)', 'space': 'O(n)'},
+    'subset_sum': {'time': 'O(n * target)', 'space': 'O(n * target)'}
+})
+
+
+# Memo de matrices de Floyd-Warshall por digest del grafo: el cubo O(V³)
+# se calcula una vez y las consultas repetidas sobre el mismo grafo
+# (compare, queries sucesivas de UI) reconstruyen caminos en O(V).
+# LRU chico: cada entrada guarda dos matrices V×V.
+_FW_CACHE_MAX = 32
+_fw_matrix_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_fw_matrix_lock = threading.Lock()
+
+
+def _graph_digest(graph: Dict[int, List[Tuple[int, float]]]) -> bytes:
+    """Digest estable del grafo, independiente del orden de inserción."""
+    h = hashlib.blake2b(digest_size=16)
+    for u in sorted(graph):
+        h.update(repr((u, sorted(graph[u]))).encode())
+    return h.digest()
+
+
+def _fw_matrices(graph: Dict[int, List[Tuple[int, float]]]) -> Dict[str, Any]:
+    """Matrices distances/next de Floyd-Warshall, memoizadas por grafo."""
+    key = _graph_digest(graph)
+    with _fw_matrix_lock:
+        if key in _fw_matrix_cache:
+            _fw_matrix_cache.move_to_end(key)
+            return _fw_matrix_cache[key]
+    result = floyd_warshall_numpy(graph)
+    with _fw_matrix_lock:
+        _fw_matrix_cache[key] = result
+        if len(_fw_matrix_cache) > _FW_CACHE_MAX:
+            _fw_matrix_cache.popitem(last=False)
+    return result
+
+
+def _no_path(start: int, end: int, **extra: Any) -> Dict[str, Any]:
+    """Resultado estándar de "sin camino" compartido por los *_path."""
+    return {'found': False, 'error': f'No existe camino desde {start} a {end}', **extra}
+
+
 class AlgorithmsService:
     """Servicio que encapsula todos los algoritmos de grafos y problemas de optimización."""
 
@@ -39,6 +107,44 @@ class AlgorithmsService:
         """
         return bfs(graph, start)
 
+    @staticmethod
+    def bfs_traversal_csr(indptr, indices, start: int) -> Dict[str, Any]:
+        """
+        Ejecuta BFS sobre un grafo ya convertido a CSR (SoA).
+
+        Complejidad: O(V + E), con escaneo de aristas sobre arrays contiguos
+
+        Args:
+            indptr: Offsets CSR por nodo
+            indices: Vecinos aplanados
+            start: Nodo inicial
+
+        Returns:
+            Dict con orden de visita, distancias y padres
+        """
+        return bfs_csr(indptr, indices, start)
+
+    @staticmethod
+    def bfs_multi_source(graph: Dict[int, List[int]], sources: List[int]) -> Dict[str, Any]:
+        """
+        Ejecuta BFS desde varias fuentes con una sola frontera fusionada.
+
+        Complejidad: O(V + E) total, contra O(S·(V+E)) de un BFS por fuente
+
+        Args:
+            graph: Grafo representado como diccionario de adyacencia
+            sources: Nodos iniciales
+
+        Returns:
+            Dict con distancias, padres y fuente más cercana por nodo
+        """
+        result = bfs_multi_source(graph, sources)
+        return {
+            **result,
+            'num_sources': len(set(sources)),
+            'algorithm': 'BFS (Multi-Source)'
+        }
+
     @staticmethod
     def bfs_shortest_path(graph: Dict[int, List[int]], start: int, end: int) -> Optional[List[int]]:
         """
@@ -189,7 +295,7 @@ class AlgorithmsService:
     # ==================== Dijkstra Algorithms ====================
 
     @staticmethod
-    def dijkstra_shortest_paths(graph: Dict[int, List[Tuple[int, float]]], start: int) -> Dict[str, Any]:
+    def dijkstra_shortest_paths(graph: Dict[int, List[Tuple[int, float]]], start: int, skip_stale: bool = True) -> Dict[str, Any]:
         """
         Encuentra los caminos más cortos desde un nodo inicial usando Dijkstra.
 
@@ -198,11 +304,38 @@ class AlgorithmsService:
         Args:
             graph: Grafo con pesos representado como {nodo: [(vecino, peso), ...]}
             start: Nodo inicial
+            skip_stale: Descarta entradas obsoletas del heap al extraerlas
+
+        Returns:
+            Dict con distancias y padres de todos los nodos alcanzables
+        """
+        result = dijkstra(graph, start, skip_stale=skip_stale)
+        return {
+            'start_node': start,
+            'distances': result['distances'],
+            'parents': result['parents'],
+            'num_reachable': len(result['distances']),
+            'algorithm': 'Dijkstra'
+        }
+
+    @staticmethod
+    def dijkstra_shortest_paths_csr(indptr, indices, weights, start: int) -> Dict[str, Any]:
+        """
+        Dijkstra sobre un grafo ya convertido a CSR (SoA).
+
+        Complejidad: O((V + E) log V), con escaneo de aristas sobre
+        arrays contiguos en lugar de tuplas Python
+
+        Args:
+            indptr: Offsets CSR por nodo
+            indices: Vecinos aplanados
+            weights: Pesos alineados con indices
+            start: Nodo inicial
 
         Returns:
             Dict con distancias y padres de todos los nodos alcanzables
         """
-        result = dijkstra(graph, start)
+        result = dijkstra_csr(indptr, indices, weights, start)
         return {
             'start_node': start,
             'distances': result['distances'],
@@ -228,12 +361,7 @@ class AlgorithmsService:
         """
         result = dijkstra_path(graph, start, end)
         if result is None:
-            return {
-                'found': False,
-                'path': None,
-                'distance': None,
-                'error': f'No existe camino desde {start} a {end}'
-            }
+            return _no_path(start, end, path=None, distance=None)
         return {
             'found': True,
             'path': result['path'],
@@ -241,6 +369,75 @@ class AlgorithmsService:
             'all_distances': result['all_distances']
         }
 
+    @staticmethod
+    def delta_stepping_shortest_paths(
+        graph: Dict[int, List[Tuple[int, float]]],
+        start: int,
+        delta: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Caminos más cortos desde un nodo usando delta-stepping.
+
+        Alternativa a Dijkstra para pesos positivos: procesa cubetas de
+        distancia tentativa casi igual y evita el O(log V) del heap en
+        la mayoría de las relajaciones.
+
+        Args:
+            graph: Grafo con pesos positivos
+            start: Nodo inicial
+            delta: Ancho de cubeta; si se omite se estima como
+                peso_máximo / grado_promedio
+
+        Returns:
+            Dict con distancias y padres de todos los nodos alcanzables
+        """
+        if delta is None:
+            num_edges = sum(len(neighbors) for neighbors in graph.values())
+            max_weight = max(
+                (w for neighbors in graph.values() for _, w in neighbors),
+                default=1.0
+            )
+            avg_degree = num_edges / len(graph) if graph else 1.0
+            delta = max(max_weight / max(avg_degree, 1.0), 1e-9)
+
+        result = delta_stepping(graph, start, delta)
+        return {
+            'start_node': start,
+            'distances': result['distances'],
+            'parents': result['parents'],
+            'num_reachable': len(result['distances']),
+            'delta': delta,
+            'algorithm': 'Delta-Stepping'
+        }
+
+    @staticmethod
+    def dijkstra_bidirectional_path(graph: Dict[int, List[Tuple[int, float]]], start: int, end: int) -> Dict[str, Any]:
+        """
+        Camino más corto entre dos nodos con Dijkstra bidireccional.
+
+        Dos fronteras (desde start y desde end sobre el grafo invertido)
+        que paran al encontrarse: asienta muchos menos nodos que el
+        Dijkstra single-source en grafos dispersos grandes.
+
+        Complejidad: O((V + E) log V), con constantes menores por par
+
+        Args:
+            graph: Grafo con pesos positivos
+            start: Nodo inicial
+            end: Nodo final
+
+        Returns:
+            Dict con camino y distancia, o información de no alcanzable
+        """
+        result = dijkstra_bidirectional(graph, start, end)
+        if result is None:
+            return _no_path(start, end, path=None, distance=None)
+        return {
+            'found': True,
+            'path': result['path'],
+            'distance': result['distance']
+        }
+
     @staticmethod
     def dijkstra_all_paths_from(graph: Dict[int, List[Tuple[int, float]]], start: int) -> Dict[str, Any]:
         """
@@ -263,6 +460,24 @@ class AlgorithmsService:
             'algorithm': 'Dijkstra All Paths'
         }
 
+    @staticmethod
+    def iter_dijkstra_paths(graph: Dict[int, List[Tuple[int, float]]], start: int):
+        """
+        Genera los caminos más cortos desde un nodo, destino por destino.
+
+        Variante streaming de `dijkstra_all_paths_from`: nunca materializa
+        el dict completo de caminos, así la respuesta puede serializarse
+        con memoria O(V) por camino.
+
+        Args:
+            graph: Grafo con pesos
+            start: Nodo inicial
+
+        Yields:
+            Tuplas (nodo_destino, {"path": [...], "distance": d})
+        """
+        return iter_dijkstra_all_paths(graph, start)
+
     # ==================== Bellman-Ford Algorithms ====================
 
     @staticmethod
@@ -282,6 +497,15 @@ class AlgorithmsService:
             Dict con distancias, padres, y detección de ciclos negativos
         """
         result = bellman_ford(graph, start)
+        if result is None:
+            # Ciclo negativo: no hay distancias bien definidas que reportar
+            return {
+                'start_node': start,
+                'distances': {},
+                'parents': {},
+                'has_negative_cycle': True,
+                'algorithm': 'Bellman-Ford'
+            }
         return {
             'start_node': start,
             'distances': result['distances'],
@@ -307,10 +531,7 @@ class AlgorithmsService:
         """
         result = bellman_ford_path(graph, start, end)
         if result is None:
-            return {
-                'found': False,
-                'error': f'No existe camino desde {start} a {end}'
-            }
+            return _no_path(start, end)
         return {
             'found': True,
             'path': result['path'],
@@ -332,7 +553,7 @@ class AlgorithmsService:
         Returns:
             Dict con matriz de distancias y matriz de caminos
         """
-        result = floyd_warshall(graph)
+        result = _fw_matrices(graph)
         return {
             'distances': result['distances'],
             'paths': result.get('paths', {}),
@@ -340,12 +561,31 @@ class AlgorithmsService:
             'num_nodes': len(result['distances']) if result['distances'] else 0
         }
 
+    @staticmethod
+    def floyd_warshall_distance_matrix(graph: Dict[int, List[Tuple[int, float]]]):
+        """
+        Devuelve la matriz de distancias de Floyd-Warshall como ndarray.
+
+        Pensado para serialización por filas (streaming): el router
+        escribe fila a fila sin convertir la matriz V×V a listas Python.
+
+        Args:
+            graph: Grafo con pesos
+
+        Returns:
+            ndarray float32 (V, V) con np.inf donde no hay camino
+        """
+        dist, _ = floyd_warshall_arrays(graph)
+        return dist
+
     @staticmethod
     def floyd_warshall_path(graph: Dict[int, List[Tuple[int, float]]], start: int, end: int) -> Dict[str, Any]:
         """
         Encuentra el camino más corto entre dos nodos usando Floyd-Warshall.
 
-        Complejidad: O(V³) para calcular todas las distancias
+        Complejidad: O(V³) la primera vez por grafo; las consultas
+        siguientes sobre el mismo grafo reusan las matrices memoizadas
+        y solo reconstruyen el camino en O(V)
 
         Args:
             graph: Grafo con pesos
@@ -355,16 +595,22 @@ class AlgorithmsService:
         Returns:
             Dict con camino y distancia
         """
-        result = floyd_warshall_with_paths(graph, start, end)
-        if result is None:
-            return {
-                'found': False,
-                'error': f'No existe camino desde {start} a {end}'
-            }
+        result = _fw_matrices(graph)
+        distances = result['distances']
+        n = len(distances)
+        # El chequeo de negativos evita que start=-1 lea la fila n-1 de
+        # la matriz vía el indexado negativo y "encuentre" un camino
+        if not (0 <= start < n and 0 <= end < n) or distances[start][end] == float('inf'):
+            return _no_path(start, end)
+        if start == end:
+            return {'found': True, 'path': [start], 'distance': 0}
+        path = reconstruct_path_fw(result['next'], start, end)
+        if path is None:
+            return _no_path(start, end)
         return {
             'found': True,
-            'path': result['path'],
-            'distance': result['distance']
+            'path': path,
+            'distance': distances[start][end]
         }
 
     # ==================== MST Algorithms ====================
@@ -390,6 +636,32 @@ class AlgorithmsService:
             'is_minimum_spanning_tree': result['is_connected']
         }
 
+    @staticmethod
+    def kruskal_mst_soa(u, v, w, num_vertices: int) -> Dict[str, Any]:
+        """
+        Encuentra el MST usando Kruskal sobre aristas en arrays paralelos.
+
+        El ordenamiento por peso corre como np.argsort en C sobre float32
+        en lugar de un sort de tuplas Python.
+
+        Complejidad: O(E log E)
+
+        Args:
+            u: Nodos origen (int32)
+            v: Nodos destino (int32)
+            w: Pesos (float32)
+            num_vertices: Número de vértices
+
+        Returns:
+            Dict con aristas del MST y peso total
+        """
+        result = kruskal_soa(u, v, w, num_vertices)
+        return {
+            **result,
+            'algorithm': 'Kruskal',
+            'is_minimum_spanning_tree': result['is_connected']
+        }
+
     @staticmethod
     def kruskal_mst_from_graph(graph: Dict[int, List[Tuple[int, float]]], num_vertices: int) -> Dict[str, Any]:
         """
@@ -563,9 +835,47 @@ class AlgorithmsService:
         Returns:
             Dict con resultados de Dijkstra, Bellman-Ford y Floyd-Warshall
         """
+        def _path_from_parents(parents: Dict[int, Optional[int]]) -> List[int]:
+            path = []
+            current = end
+            while current is not None:
+                path.append(current)
+                current = parents.get(current)
+            path.reverse()
+            return path
+
+        # Una sola pasada single-source por algoritmo: el par (start, end)
+        # se extrae de las distancias/padres ya calculados en vez de
+        # repetir el heap de Dijkstra o las V-1 rondas de relajación de
+        # Bellman-Ford dentro de cada *_path
+        dij = dijkstra(graph, start)
+        if end in dij['distances']:
+            dijkstra_res = {
+                'found': True,
+                'path': _path_from_parents(dij['parents']),
+                'distance': dij['distances'][end],
+                'all_distances': dij['distances']
+            }
+        else:
+            dijkstra_res = _no_path(start, end, path=None, distance=None)
+
+        bf = bellman_ford(graph, start)
+        if bf is None:
+            bellman_res = {'found': False, 'error': 'Ciclo negativo detectado'}
+        elif bf['distances'].get(end, float('inf')) == float('inf'):
+            bellman_res = _no_path(start, end)
+        else:
+            bellman_res = {
+                'found': True,
+                'path': _path_from_parents(bf['parents']),
+                'distance': bf['distances'][end]
+            }
+
         return {
-            'dijkstra': AlgorithmsService.dijkstra_path(graph, start, end),
-            'bellman_ford': AlgorithmsService.bellman_ford_path(graph, start, end),
+            'dijkstra': dijkstra_res,
+            'bellman_ford': bellman_res,
+            # floyd_warshall_path reusa las matrices memoizadas por grafo:
+            # tras la primera llamada solo reconstruye el camino en O(V)
             'floyd_warshall': AlgorithmsService.floyd_warshall_path(graph, start, end),
             'comparison': 'Todos los algoritmos deberían dar el mismo resultado'
         }
@@ -576,21 +886,9 @@ class AlgorithmsService:
         Proporciona información sobre la complejidad de los algoritmos.
 
         Returns:
-            Dict con complejidad temporal y espacial de cada algoritmo
+            Dict (solo lectura) con complejidad temporal y espacial de cada algoritmo
         """
-        return {
-            'bfs': {'time': 'O(V + E)', 'space': 'O(V)'},
-            'dfs': {'time': 'O(V + E)', 'space': 'O(V)'},
-            'dijkstra': {'time': 'O((V + E) log V)', 'space': 'O(V)'},
-            'bellman_ford': {'time': 'O(V * E)', 'space': 'O(V)'},
-            'floyd_warshall': {'time': 'O(V³)', 'space': 'O(V²)'},
-            'kruskal_mst': {'time': 'O(E log E)', 'space': 'O(V + E)'},
-            'prim_mst': {'time': 'O(E log V)', 'space': 'O(V)'},
-            'knapsack_01': {'time': 'O(n * W)', 'space': 'O(n * W)'},
-            'knapsack_unbounded': {'time': 'O(n * W)', 'space': 'O(W)'},
-            'knapsack_fractional': {'time': 'O(n log n)', 'space': 'O(n)'},
-            'subset_sum': {'time': 'O(n * target)', 'space': 'O(n * target)'}
-        }
+        return _COMPLEXITY_INFO
 
 
 algorithms_service = AlgorithmsService()
@@ -2,155 +2,262 @@
 Graph Service - Manejo de construcción, conversión y estadísticas de grafos
 Solo se incluyen transacciones de tipo 'egreso' para el análisis de gastos.
 """
-from typing import Dict, List, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from app.models.transaction import Transaction
 from app.utils.graph_builder import GraphBuilder
 
 
+# Memo de filas y grafos por huella de la tabla: cada get_*_statistics
+# repetía el scan completo de transacciones y la reconstrucción del
+# grafo aunque nada hubiera cambiado. La huella (max id, count) se
+# obtiene con una consulta barata; las mutaciones que no la mueven
+# (updates in-place) invalidan explícitamente vía invalidate_graph_cache.
+# Un estado de tabla ocupa 7 entradas (filas + 3 grafos + 3 stats)
+_GRAPH_CACHE_MAX = 16
+_graph_cache: "OrderedDict[Tuple[str, tuple], Any]" = OrderedDict()
+_graph_cache_lock = threading.Lock()
+
+
+def invalidate_graph_cache() -> None:
+    """Vacía el memo de grafos; llamar tras crear/editar/borrar transacciones."""
+    with _graph_cache_lock:
+        _graph_cache.clear()
+
+
+def _cache_get(key: Tuple[str, tuple]) -> Any:
+    with _graph_cache_lock:
+        if key in _graph_cache:
+            _graph_cache.move_to_end(key)
+            return _graph_cache[key]
+    return None
+
+
+def _cache_put(key: Tuple[str, tuple], value: Any) -> None:
+    with _graph_cache_lock:
+        _graph_cache[key] = value
+        if len(_graph_cache) > _GRAPH_CACHE_MAX:
+            _graph_cache.popitem(last=False)
+
+
 class GraphService:
     """Servicio para manejo de grafos financieros."""
 
     @staticmethod
-    def _get_egreso_transactions(db: Session) -> List[Transaction]:
+    def _db_fingerprint(db: Session) -> tuple:
+        """Huella barata del estado de la tabla (max id, count)."""
+        return tuple(
+            db.query(func.max(Transaction.id), func.count(Transaction.id)).one()
+        )
+
+    @staticmethod
+    def _load_egreso_rows(db: Session) -> List[Dict[str, Any]]:
         """
-        Obtiene solo las transacciones de tipo 'egreso' de la base de datos.
+        Carga las transacciones de tipo 'egreso' como lista de dicts.
         Los ingresos se excluyen del análisis de grafos ya que no aportan
         valor para el análisis de patrones de gasto.
 
+        Consulta Core sobre las columnas que los builders realmente usan,
+        con yield_per para traer tuplas en lotes: sin objetos ORM, sin
+        identity map y sin columnas muertas en memoria.
+
         Args:
             db: Sesión de base de datos
 
         Returns:
-            Lista de transacciones de tipo egreso
+            Lista de dicts con id, fecha, categoria, monto y usuario
         """
-        return db.query(Transaction).filter(Transaction.tipo == 'egreso').all()
+        stmt = (
+            select(
+                Transaction.id,
+                Transaction.fecha,
+                Transaction.categoria,
+                Transaction.monto,
+                Transaction.usuario,
+            )
+            .where(Transaction.tipo == 'egreso')
+            .execution_options(yield_per=10_000)
+        )
+        return [
+            {
+                'id': row.id,
+                'fecha': row.fecha,
+                'categoria': row.categoria,
+                # float nativo: Numeric llega como Decimal y cada peso del
+                # grafo pasaría por el fallback lento del encoder JSON
+                'monto': float(abs(row.monto)),
+                'usuario': row.usuario,
+            }
+            for row in db.execute(stmt)
+        ]
+
+    _BUILDERS = {
+        'GT': GraphBuilder.build_gt,
+        'GC': GraphBuilder.build_gc,
+        'GUC': GraphBuilder.build_guc,
+    }
+
+    @staticmethod
+    def _egreso_rows_cached(db: Session, fingerprint: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Filas de egresos memoizadas por huella: un scan por estado de tabla."""
+        if fingerprint is None:
+            fingerprint = GraphService._db_fingerprint(db)
+        key = ('rows', fingerprint)
+        rows = _cache_get(key)
+        if rows is None:
+            rows = GraphService._load_egreso_rows(db)
+            _cache_put(key, rows)
+        return rows
 
     @staticmethod
-    def build_gt_from_db(db: Session) -> Dict[int, List[tuple]]:
+    def _build_cached(db: Session, kind: str, fingerprint: Optional[tuple] = None):
+        """Grafo memoizado por (tipo, huella); comparte las filas entre tipos."""
+        if fingerprint is None:
+            fingerprint = GraphService._db_fingerprint(db)
+        key = (kind, fingerprint)
+        graph = _cache_get(key)
+        if graph is None:
+            rows = GraphService._egreso_rows_cached(db, fingerprint)
+            graph = GraphService._BUILDERS[kind](rows)
+            _cache_put(key, graph)
+        return graph
+
+    @staticmethod
+    def build_gt_from_db(db: Session, memoize: bool = True) -> Dict[int, List[tuple]]:
         """
         Construye Grafo de Transacciones (GT) desde la base de datos.
         Solo incluye transacciones de tipo 'egreso'.
+
+        Con memoize=False se saltea el memo (sin SQL de huella ni
+        bookkeeping del LRU): útil para llamadas únicas tipo script.
         """
-        transactions = GraphService._get_egreso_transactions(db)
-        transactions_list = GraphService._transactions_to_dict_list(transactions)
-        return GraphBuilder.build_gt(transactions_list)
+        if not memoize:
+            return GraphBuilder.build_gt(GraphService._load_egreso_rows(db))
+        return GraphService._build_cached(db, 'GT')
 
     @staticmethod
-    def build_gc_from_db(db: Session) -> Dict[str, List[tuple]]:
+    def build_gc_from_db(db: Session, memoize: bool = True) -> Dict[str, List[tuple]]:
         """
         Construye Grafo de Categorías (GC) desde la base de datos.
         Solo incluye transacciones de tipo 'egreso'.
         """
-        transactions = GraphService._get_egreso_transactions(db)
-        transactions_list = GraphService._transactions_to_dict_list(transactions)
-        return GraphBuilder.build_gc(transactions_list)
+        if not memoize:
+            return GraphBuilder.build_gc(GraphService._load_egreso_rows(db))
+        return GraphService._build_cached(db, 'GC')
 
     @staticmethod
-    def build_guc_from_db(db: Session) -> Dict[str, List[tuple]]:
+    def build_guc_from_db(db: Session, memoize: bool = True) -> Dict[str, List[tuple]]:
         """
         Construye Grafo Usuario-Categoría (GUC) desde la base de datos.
         Solo incluye transacciones de tipo 'egreso'.
         """
-        transactions = GraphService._get_egreso_transactions(db)
-        transactions_list = GraphService._transactions_to_dict_list(transactions)
-        return GraphBuilder.build_guc(transactions_list)
+        if not memoize:
+            return GraphBuilder.build_guc(GraphService._load_egreso_rows(db))
+        return GraphService._build_cached(db, 'GUC')
 
     @staticmethod
-    def build_temporal_graph_from_db(db: Session, time_window_days: int = 7) -> Dict[int, List[tuple]]:
+    def build_temporal_graph_from_db(db: Session, time_window_days: int = 7, memoize: bool = True) -> Dict[int, List[tuple]]:
         """
         Construye grafo temporal. Solo incluye transacciones de tipo 'egreso'.
         """
-        transactions = GraphService._get_egreso_transactions(db)
-        transactions_list = GraphService._transactions_to_dict_list(transactions)
+        transactions_list = (
+            GraphService._egreso_rows_cached(db) if memoize
+            else GraphService._load_egreso_rows(db)
+        )
         return GraphBuilder.build_temporal_graph(transactions_list, time_window_days)
 
     @staticmethod
-    def build_weighted_category_graph_from_db(db: Session) -> Dict[str, List[tuple]]:
+    def build_weighted_category_graph_from_db(db: Session, memoize: bool = True) -> Dict[str, List[tuple]]:
         """
         Construye grafo de categorías ponderado. Solo incluye transacciones de tipo 'egreso'.
         """
-        transactions = GraphService._get_egreso_transactions(db)
-        transactions_list = GraphService._transactions_to_dict_list(transactions)
+        transactions_list = (
+            GraphService._egreso_rows_cached(db) if memoize
+            else GraphService._load_egreso_rows(db)
+        )
         return GraphBuilder.build_weighted_category_graph(transactions_list)
 
-    @staticmethod
-    def _transactions_to_dict_list(transactions: List[Transaction]) -> List[Dict[str, Any]]:
-        return [
-            {
-                'id': trans.id,
-                'fecha': trans.fecha,
-                'tipo': trans.tipo,
-                'categoria': trans.categoria,
-                'subcategoria': trans.subcategoria,
-                'descripcion': trans.descripcion,
-                'metodo_pago': trans.metodo_pago,
-                'monto': abs(trans.monto),
-                'usuario': trans.usuario
-            }
-            for trans in transactions
-        ]
-
     @staticmethod
     def get_graph_statistics(graph: Dict[Any, List[tuple]]) -> Dict[str, Any]:
         return GraphBuilder.get_graph_stats(graph)
 
     @staticmethod
-    def get_gt_statistics(db: Session) -> Dict[str, Any]:
-        gt = GraphService.build_gt_from_db(db)
-        stats = GraphService.get_graph_statistics(gt)
-        stats['graph_type'] = 'GT'
+    def _stats_cached(db: Session, kind: str, fingerprint: Optional[tuple] = None) -> Dict[str, Any]:
+        """Estadísticas memoizadas junto al grafo: la reducción O(V+E) de
+        get_graph_stats también se paga una sola vez por estado de tabla."""
+        if fingerprint is None:
+            fingerprint = GraphService._db_fingerprint(db)
+        key = (kind + ':stats', fingerprint)
+        stats = _cache_get(key)
+        if stats is None:
+            graph = GraphService._build_cached(db, kind, fingerprint)
+            stats = GraphService.get_graph_statistics(graph)
+            stats['graph_type'] = kind
+            _cache_put(key, stats)
         return stats
 
+    @staticmethod
+    def get_gt_statistics(db: Session) -> Dict[str, Any]:
+        return GraphService._stats_cached(db, 'GT')
+
     @staticmethod
     def get_gc_statistics(db: Session) -> Dict[str, Any]:
-        gc = GraphService.build_gc_from_db(db)
-        stats = GraphService.get_graph_statistics(gc)
-        stats['graph_type'] = 'GC'
-        return stats
+        return GraphService._stats_cached(db, 'GC')
 
     @staticmethod
     def get_guc_statistics(db: Session) -> Dict[str, Any]:
-        guc = GraphService.build_guc_from_db(db)
-        stats = GraphService.get_graph_statistics(guc)
-        stats['graph_type'] = 'GUC'
-        return stats
+        return GraphService._stats_cached(db, 'GUC')
 
     @staticmethod
     def compare_graph_types(db: Session) -> Dict[str, Any]:
+        fingerprint = GraphService._db_fingerprint(db)
         return {
-            'gt': GraphService.get_gt_statistics(db),
-            'gc': GraphService.get_gc_statistics(db),
-            'guc': GraphService.get_guc_statistics(db)
+            kind.lower(): GraphService._stats_cached(db, kind, fingerprint)
+            for kind in GraphService._BUILDERS
         }
 
     @staticmethod
     def get_graph_summary(db: Session) -> Dict[str, Any]:
-        all_transactions = db.query(Transaction).all()
-        egresos = [t for t in all_transactions if t.tipo == 'egreso']
-        ingresos = [t for t in all_transactions if t.tipo == 'ingreso']
-
-        num_egresos = len(egresos)
-        total_egresos = sum(abs(t.monto) for t in egresos) if egresos else 0
-        total_ingresos = sum(abs(t.monto) for t in ingresos) if ingresos else 0
+        # Agregación en SQL en lugar de hidratar todas las transacciones
+        # como objetos ORM: dos consultas chicas (conteos/sumas por tipo
+        # y cardinalidades de egresos) devuelven un puñado de escalares
+        counts_by_tipo = {
+            row.tipo: (row.num, float(row.total or 0))
+            for row in db.execute(
+                select(
+                    Transaction.tipo,
+                    func.count().label('num'),
+                    func.sum(func.abs(Transaction.monto)).label('total'),
+                ).group_by(Transaction.tipo)
+            )
+        }
+        num_egresos, total_egresos = counts_by_tipo.get('egreso', (0, 0.0))
+        num_ingresos, total_ingresos = counts_by_tipo.get('ingreso', (0, 0.0))
 
-        usuarios = set(t.usuario for t in egresos)
-        categorias = set(t.categoria for t in egresos)
+        num_usuarios, num_categorias = db.execute(
+            select(
+                func.count(func.distinct(Transaction.usuario)),
+                func.count(func.distinct(Transaction.categoria)),
+            ).where(Transaction.tipo == 'egreso')
+        ).one()
 
         return {
-            'num_transactions': len(all_transactions),
+            'num_transactions': sum(num for num, _ in counts_by_tipo.values()),
             'num_egresos': num_egresos,
-            'num_ingresos': len(ingresos),
-            'num_usuarios': len(usuarios),
-            'num_categorias': len(categorias),
+            'num_ingresos': num_ingresos,
+            'num_usuarios': num_usuarios,
+            'num_categorias': num_categorias,
             'total_egresos': float(total_egresos),
             'total_ingresos': float(total_ingresos),
             'balance': float(total_ingresos - total_egresos),
             'avg_egreso': float(total_egresos / num_egresos) if num_egresos > 0 else 0,
             'graphs_available': {
                 'gt': num_egresos > 1,
-                'gc': len(categorias) > 1,
-                'guc': len(usuarios) > 0 and len(categorias) > 0
+                'gc': num_categorias > 1,
+                'guc': num_usuarios > 0 and num_categorias > 0
             },
             'nota': 'Los grafos solo incluyen transacciones de tipo egreso'
         }
@@ -1,24 +1,45 @@
+from sqlalchemy import func, insert, lambda_stmt, select, text
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.models.transaction import Transaction
 from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services.graph_service import invalidate_graph_cache
 
 
 class TransactionService:
+    # Las consultas calientes van como lambda statements: la construcción
+    # del select y su compilación a SQL se cachean por forma de consulta
+    # (los valores capturados se vuelven bind params), en lugar de
+    # rearmarse y recompilarse en cada llamada.
+
     @staticmethod
     def get_transaction(db: Session, transaction_id: int) -> Optional[Transaction]:
         """Get transaction by ID."""
-        return db.query(Transaction).filter(Transaction.id == transaction_id).first()
+        stmt = lambda_stmt(
+            lambda: select(Transaction).where(Transaction.id == transaction_id)
+        )
+        return db.execute(stmt).scalar_one_or_none()
 
     @staticmethod
     def get_user_transactions(db: Session, usuario: str, skip: int = 0, limit: int = 100) -> List[Transaction]:
         """Get all transactions for a user."""
-        return db.query(Transaction).filter(Transaction.usuario == usuario).offset(skip).limit(limit).all()
+        stmt = lambda_stmt(
+            lambda: select(Transaction)
+            .where(Transaction.usuario == usuario)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(db.execute(stmt).scalars())
 
     @staticmethod
     def count_user_transactions(db: Session, usuario: str) -> int:
         """Count all transactions for a user."""
-        return db.query(Transaction).filter(Transaction.usuario == usuario).count()
+        stmt = lambda_stmt(
+            lambda: select(func.count())
+            .select_from(Transaction)
+            .where(Transaction.usuario == usuario)
+        )
+        return db.execute(stmt).scalar_one()
 
     @staticmethod
     def get_all_transactions(db: Session, skip: int = 0, limit: int = 1000) -> List[Transaction]:
@@ -30,6 +51,29 @@ class TransactionService:
         """Count all transactions."""
         return db.query(Transaction).count()
 
+    @staticmethod
+    def estimate_all_transactions(db: Session) -> Tuple[int, bool]:
+        """Total de transacciones, como estimación barata si el motor lo permite.
+
+        En Postgres un COUNT(*) sin filtro recorre el heap completo; el
+        planner mantiene reltuples actualizado por autovacuum y leerlo
+        es O(1). Para paginación el estimado basta. Otros dialectos (y
+        una tabla aún sin analizar) caen al COUNT exacto.
+
+        Returns:
+            Tupla (total, es_estimado)
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            estimate = db.execute(text(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = 'transactions'"
+            )).scalar()
+            # reltuples == 0 también significa "tabla nunca analizada"
+            # (en PG < 14 el valor inicial es 0, no -1): solo confiar en
+            # estimados positivos y caer al COUNT exacto en el resto
+            if estimate is not None and estimate > 0:
+                return int(estimate), True
+        return TransactionService.count_all_transactions(db), False
+
     @staticmethod
     def create_transaction(db: Session, transaction: TransactionCreate) -> Transaction:
         """Create a new transaction."""
@@ -37,8 +81,29 @@ class TransactionService:
         db.add(db_transaction)
         db.commit()
         db.refresh(db_transaction)
+        invalidate_graph_cache()
         return db_transaction
 
+    @staticmethod
+    def create_transactions_bulk(db: Session, transactions: List[TransactionCreate]) -> int:
+        """Create many transactions with batched INSERTs and one commit.
+
+        Inserting row-by-row through create_transaction pays a commit
+        (fsync round-trip) per row; here the rows go in executemany
+        batches of 10k and the transaction commits once at the end.
+        """
+        created_count = 0
+        for start in range(0, len(transactions), 10_000):
+            batch = [
+                t.model_dump()
+                for t in transactions[start:start + 10_000]
+            ]
+            db.execute(insert(Transaction), batch)
+            created_count += len(batch)
+        db.commit()
+        invalidate_graph_cache()
+        return created_count
+
     @staticmethod
     def update_transaction(
         db: Session,
@@ -56,6 +121,7 @@ class TransactionService:
 
         db.commit()
         db.refresh(db_transaction)
+        invalidate_graph_cache()
         return db_transaction
 
     @staticmethod
@@ -67,6 +133,7 @@ class TransactionService:
 
         db.delete(db_transaction)
         db.commit()
+        invalidate_graph_cache()
         return True
 
 
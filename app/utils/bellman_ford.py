@@ -4,8 +4,20 @@ Complejidad: O(V * E)
 """
 from typing import Dict, List, Tuple, Optional
 
+import numpy as np
 
-def bellman_ford(graph: Dict[int, List[Tuple[int, float]]], start: int, num_vertices: int) -> Optional[Dict[str, any]]:
+
+def _infer_num_vertices(graph: Dict[int, List[Tuple[int, float]]], *extra_nodes: int) -> int:
+    """Deriva el número de vértices del grafo (ids contiguos desde 0)."""
+    n = max(extra_nodes, default=-1) + 1
+    for u, neighbors in graph.items():
+        n = max(n, u + 1)
+        for v, _ in neighbors:
+            n = max(n, v + 1)
+    return n
+
+
+def bellman_ford(graph: Dict[int, List[Tuple[int, float]]], start: int, num_vertices: Optional[int] = None) -> Optional[Dict[str, any]]:
     """
     Algoritmo de Bellman-Ford para encontrar caminos más cortos.
     Funciona con pesos negativos y detecta ciclos negativos.
@@ -13,53 +25,73 @@ def bellman_ford(graph: Dict[int, List[Tuple[int, float]]], start: int, num_vert
     Args:
         graph: Grafo representado como {nodo: [(vecino, peso), ...]}
         start: Nodo inicial
-        num_vertices: Número total de vértices
+        num_vertices: Número total de vértices; se deriva del grafo si se omite
 
     Returns:
         Dict con distancias y padres, o None si hay ciclo negativo
     """
-    # Inicializar distancias
-    distances = {i: float('inf') for i in range(num_vertices)}
-    distances[start] = 0
-    parents = {i: None for i in range(num_vertices)}
-
-    # Relajar todas las aristas V-1 veces
+    # Los arrays indexan por id denso 0..n-1: un start negativo aliasaría
+    # al nodo n-1 vía el indexado negativo en lugar de fallar
+    if start < 0:
+        raise ValueError(f"El nodo inicial {start} no existe en el grafo")
+
+    if num_vertices is None:
+        num_vertices = _infer_num_vertices(graph, start)
+
+    # Aristas como arrays paralelos (SoA): cada ronda de relajación es
+    # suma + comparación vectorizada sobre arrays contiguos en lugar de
+    # E operaciones Python por pasada
+    num_edges = sum(len(neighbors) for neighbors in graph.values())
+    u_arr = np.empty(num_edges, dtype=np.int32)
+    v_arr = np.empty(num_edges, dtype=np.int32)
+    w_arr = np.empty(num_edges, dtype=np.float64)
+    pos = 0
+    for u, neighbors in graph.items():
+        for v, weight in neighbors:
+            u_arr[pos] = u
+            v_arr[pos] = v
+            w_arr[pos] = weight
+            pos += 1
+
+    dist = np.full(num_vertices, np.inf, dtype=np.float64)
+    dist[start] = 0.0
+    parent = np.full(num_vertices, -1, dtype=np.int32)
+
+    # Relajar todas las aristas V-1 veces (estilo Jacobi: todas las
+    # candidatas de una ronda se calculan contra las distancias previas,
+    # misma garantía de convergencia que la relajación arista por arista)
     for _ in range(num_vertices - 1):
-        updated = False
-        for node in graph:
-            if node in distances and distances[node] != float('inf'):
-                for neighbor, weight in graph[node]:
-                    if distances[node] + weight < distances[neighbor]:
-                        distances[neighbor] = distances[node] + weight
-                        parents[neighbor] = node
-                        updated = True
-
+        cand = dist[u_arr] + w_arr
+        improved = cand < dist[v_arr]
         # Optimización: si no hubo actualizaciones, terminar
-        if not updated:
+        if not improved.any():
             break
-
-    # Verificar ciclos negativos
-    has_negative_cycle = False
-    for node in graph:
-        if node in distances and distances[node] != float('inf'):
-            for neighbor, weight in graph[node]:
-                if distances[node] + weight < distances[neighbor]:
-                    has_negative_cycle = True
-                    break
-        if has_negative_cycle:
-            break
-
-    if has_negative_cycle:
+        vi = v_arr[improved]
+        ci = cand[improved]
+        # minimum.at resuelve destinos duplicados dentro de la ronda;
+        # los padres se fijan con las aristas que lograron el mínimo
+        np.minimum.at(dist, vi, ci)
+        winners = ci == dist[vi]
+        parent[vi[winners]] = u_arr[improved][winners]
+
+    # Verificar ciclos negativos: una pasada vectorizada extra
+    if num_edges and bool((dist[u_arr] + w_arr < dist[v_arr]).any()):
         return None
 
+    reachable = np.isfinite(dist)
     return {
-        "distances": {k: v for k, v in distances.items() if v != float('inf')},
-        "parents": parents,
+        "distances": {
+            int(i): float(dist[i]) for i in np.flatnonzero(reachable)
+        },
+        "parents": {
+            i: (int(parent[i]) if parent[i] >= 0 else None)
+            for i in range(num_vertices)
+        },
         "has_negative_cycle": False
     }
 
 
-def bellman_ford_path(graph: Dict[int, List[Tuple[int, float]]], start: int, end: int, num_vertices: int) -> Optional[Dict[str, any]]:
+def bellman_ford_path(graph: Dict[int, List[Tuple[int, float]]], start: int, end: int, num_vertices: Optional[int] = None) -> Optional[Dict[str, any]]:
     """
     Encuentra el camino más corto usando Bellman-Ford.
 
@@ -67,11 +99,13 @@ def bellman_ford_path(graph: Dict[int, List[Tuple[int, float]]], start: int, end
         graph: Grafo con pesos (pueden ser negativos)
         start: Nodo inicial
         end: Nodo final
-        num_vertices: Número total de vértices
+        num_vertices: Número total de vértices; se deriva del grafo si se omite
 
     Returns:
         Dict con camino y distancia, o None si hay ciclo negativo o no existe camino
     """
+    if num_vertices is None:
+        num_vertices = _infer_num_vertices(graph, start, end)
     result = bellman_ford(graph, start, num_vertices)
 
     if result is None:
@@ -103,6 +137,12 @@ def detect_negative_cycle(graph: Dict[int, List[Tuple[int, float]]], num_vertice
     """
     Detecta si existe un ciclo negativo en el grafo.
 
+    Súper-fuente implícita: todas las distancias arrancan en 0, como si
+    un nodo virtual tuviera aristas de peso 0 hacia todos. Eso detecta
+    ciclos en cualquier componente (correr desde el nodo 0 solo veía los
+    alcanzables desde 0) y evita reconstruir caminos/padres que acá no
+    se usan: solo las rondas vectorizadas de relajación y el check final.
+
     Args:
         graph: Grafo con pesos
         num_vertices: Número total de vértices
@@ -110,7 +150,27 @@ def detect_negative_cycle(graph: Dict[int, List[Tuple[int, float]]], num_vertice
     Returns:
         True si hay ciclo negativo, False en caso contrario
     """
-    # Ejecutar desde el nodo 0
-    result = bellman_ford(graph, 0, num_vertices)
+    num_edges = sum(len(neighbors) for neighbors in graph.values())
+    if num_edges == 0:
+        return False
+
+    u_arr = np.empty(num_edges, dtype=np.int32)
+    v_arr = np.empty(num_edges, dtype=np.int32)
+    w_arr = np.empty(num_edges, dtype=np.float64)
+    pos = 0
+    for u, neighbors in graph.items():
+        for v, weight in neighbors:
+            u_arr[pos] = u
+            v_arr[pos] = v
+            w_arr[pos] = weight
+            pos += 1
+
+    dist = np.zeros(num_vertices, dtype=np.float64)
+    for _ in range(num_vertices - 1):
+        cand = dist[u_arr] + w_arr
+        improved = cand < dist[v_arr]
+        if not improved.any():
+            return False
+        np.minimum.at(dist, v_arr[improved], cand[improved])
 
-    return result is None
+    return bool((dist[u_arr] + w_arr < dist[v_arr]).any())
@@ -2,24 +2,82 @@
 BFS (Breadth-First Search) Algorithm
 Complejidad: O(V + E)
 """
+import threading
 from collections import deque
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
+import numpy as np
 
-def bfs(graph: Dict[int, List[int]], start: int) -> Dict[str, any]:
+# Pool de buffers por hilo: los arrays visited/dist/parent se reusan entre
+# requests en lugar de reasignarse; resetearlos es un memset en C. Para
+# grafos chicos la asignación domina sobre el algoritmo en sí.
+_tls = threading.local()
+
+
+def _get_buffers(n: int):
+    """
+    Devuelve (visited, dist, parent) presized para n nodos, ya reseteados.
+
+    Los buffers crecen monotónicamente con el n más grande visto por el
+    hilo y se comparten entre llamadas; cada request recibe vistas [:n].
+    """
+    buffers = getattr(_tls, "bfs_buffers", None)
+    if buffers is None or len(buffers[0]) < n:
+        buffers = (
+            np.zeros(n, dtype=bool),
+            np.zeros(n, dtype=np.int32),
+            np.full(n, -1, dtype=np.int32),
+        )
+        _tls.bfs_buffers = buffers
+    visited, dist, parent = (buf[:n] for buf in buffers)
+    visited.fill(False)
+    dist.fill(0)
+    parent.fill(-1)
+    return visited, dist, parent
+
+
+def _node_bounds(graph: Dict[int, List[int]], *extra_nodes: int) -> Tuple[int, int]:
+    """
+    Rango [mínimo, máximo] de ids del grafo.
+
+    Los buffers de visitados se indexan con `node - mínimo`: reindexado
+    denso a 0..V-1 que además evita que los ids negativos (el esquema
+    los acepta) aliasen vía el indexado negativo de Python.
+    """
+    lo = min(extra_nodes, default=0)
+    hi = max(extra_nodes, default=0)
+    for u, neighbors in graph.items():
+        if u < lo:
+            lo = u
+        elif u > hi:
+            hi = u
+        for v in neighbors:
+            if v < lo:
+                lo = v
+            elif v > hi:
+                hi = v
+    return lo, hi
+
+
+def bfs(graph: Dict[int, List[int]], start: int, stop_at: Optional[int] = None) -> Dict[str, any]:
     """
     Ejecuta BFS desde un nodo inicial.
 
     Args:
         graph: Grafo representado como diccionario de adyacencia
         start: Nodo inicial
+        stop_at: Nodo objetivo opcional; el recorrido corta al asentarlo,
+            sin explorar el resto del grafo
 
     Returns:
         Dict con orden de visita, distancias y padres
     """
-    visited = set()
+    # Visitados en un bytearray indexado por nodo reindexado (node - lo):
+    # membership por índice en lugar de hash+probe de set por arista
+    lo, hi = _node_bounds(graph, start)
+    visited = bytearray(hi - lo + 1)
+    visited[start - lo] = 1
     queue = deque([start])
-    visited.add(start)
 
     order = []
     distances = {start: 0}
@@ -28,11 +86,13 @@ def bfs(graph: Dict[int, List[int]], start: int) -> Dict[str, any]:
     while queue:
         node = queue.popleft()
         order.append(node)
+        if node == stop_at:
+            break
 
         if node in graph:
             for neighbor in graph[node]:
-                if neighbor not in visited:
-                    visited.add(neighbor)
+                if not visited[neighbor - lo]:
+                    visited[neighbor - lo] = 1
                     queue.append(neighbor)
                     distances[neighbor] = distances[node] + 1
                     parents[neighbor] = node
@@ -41,7 +101,61 @@ def bfs(graph: Dict[int, List[int]], start: int) -> Dict[str, any]:
         "order": order,
         "distances": distances,
         "parents": parents,
-        "visited_count": len(visited)
+        "visited_count": len(distances)
+    }
+
+
+def bfs_csr(indptr: np.ndarray, indices: np.ndarray, start: int) -> Dict[str, any]:
+    """
+    BFS sobre un grafo en formato CSR (indptr/indices int32).
+
+    Misma salida que bfs(), pero recorriendo arrays contiguos en lugar de
+    dict/list con ints boxed: el escaneo de aristas toca 4 B por vecino.
+
+    Args:
+        indptr: Offsets CSR por nodo (tamaño n+1)
+        indices: Vecinos aplanados
+        start: Nodo inicial
+
+    Returns:
+        Dict con orden de visita, distancias y padres
+    """
+    n = len(indptr) - 1
+    if start >= n:
+        # Nodo aislado que no aparece en el grafo
+        return {
+            "order": [start],
+            "distances": {start: 0},
+            "parents": {start: None},
+            "visited_count": 1
+        }
+
+    visited, dist, parent = _get_buffers(n)
+    visited[start] = True
+
+    # La lista de orden de visita hace de frontera: recorrerla con un
+    # índice de cabeza equivale a la cola FIFO (cada nodo se anexa una
+    # sola vez), sin mantener un deque duplicado al lado
+    order = [start]
+    head = 0
+
+    while head < len(order):
+        node = order[head]
+        head += 1
+        for idx in range(indptr[node], indptr[node + 1]):
+            neighbor = int(indices[idx])
+            if not visited[neighbor]:
+                visited[neighbor] = True
+                dist[neighbor] = dist[node] + 1
+                parent[neighbor] = node
+                order.append(neighbor)
+
+    # El orden de inserción coincide con el orden de visita BFS
+    return {
+        "order": order,
+        "distances": {node: int(dist[node]) for node in order},
+        "parents": {node: (int(parent[node]) if parent[node] >= 0 else None) for node in order},
+        "visited_count": len(order)
     }
 
 
@@ -60,20 +174,26 @@ def bfs_shortest_path(graph: Dict[int, List[int]], start: int, end: int) -> Opti
     if start == end:
         return [start]
 
-    visited = set([start])
-    queue = deque([(start, [start])])
+    # Punteros a padre en lugar de una copia del camino por entrada de
+    # cola: encolar es O(1) y el camino se reconstruye una sola vez al
+    # final, en vez de O(V) de copia por arista explorada
+    parents = {start: None}
+    queue = deque([start])
 
     while queue:
-        node, path = queue.popleft()
-
-        if node in graph:
-            for neighbor in graph[node]:
-                if neighbor == end:
-                    return path + [neighbor]
+        node = queue.popleft()
 
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
+        for neighbor in graph.get(node, ()):
+            if neighbor in parents:
+                continue
+            parents[neighbor] = node
+            if neighbor == end:
+                path = [end]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                path.reverse()
+                return path
+            queue.append(neighbor)
 
     return None
 
@@ -89,7 +209,9 @@ def bfs_levels(graph: Dict[int, List[int]], start: int) -> Dict[int, List[int]]:
     Returns:
         Dict con niveles y sus nodos
     """
-    visited = set([start])
+    lo, hi = _node_bounds(graph, start)
+    visited = bytearray(hi - lo + 1)
+    visited[start - lo] = 1
     queue = deque([(start, 0)])
     levels = {0: [start]}
 
@@ -98,8 +220,8 @@ def bfs_levels(graph: Dict[int, List[int]], start: int) -> Dict[int, List[int]]:
 
         if node in graph:
             for neighbor in graph[node]:
-                if neighbor not in visited:
-                    visited.add(neighbor)
+                if not visited[neighbor - lo]:
+                    visited[neighbor - lo] = 1
                     queue.append((neighbor, level + 1))
 
                     if level + 1 not in levels:
@@ -107,3 +229,56 @@ def bfs_levels(graph: Dict[int, List[int]], start: int) -> Dict[int, List[int]]:
                     levels[level + 1].append(neighbor)
 
     return levels
+
+
+def bfs_multi_source(graph: Dict[int, List[int]], sources: List[int]) -> Dict[str, any]:
+    """
+    BFS multi-fuente: todas las fuentes arrancan en una sola frontera.
+
+    Repetir BFS por fuente cuesta O(S·(V+E)) y realoja visited/cola S
+    veces; con la frontera fusionada cada nodo se asienta una única vez
+    a distancia de su fuente más cercana, en una sola pasada O(V + E).
+    `nearest_source` entrega de paso la partición tipo Voronoi (qué
+    fuente queda más cerca de cada nodo alcanzado).
+
+    Args:
+        graph: Grafo representado como diccionario de adyacencia
+        sources: Nodos iniciales; las duplicadas se ignoran
+
+    Returns:
+        Dict con distancias, padres y fuente más cercana por nodo
+    """
+    # Membership O(1) por índice, sin el hashing por nodo de un set
+    lo, hi = _node_bounds(graph, *sources)
+    visited = bytearray(hi - lo + 1)
+    distances: Dict[int, int] = {}
+    parents: Dict[int, Optional[int]] = {}
+    nearest_source: Dict[int, int] = {}
+
+    queue = deque()
+    for s in sources:
+        if not visited[s - lo]:
+            visited[s - lo] = 1
+            distances[s] = 0
+            parents[s] = None
+            nearest_source[s] = s
+            queue.append(s)
+
+    while queue:
+        node = queue.popleft()
+        node_dist = distances[node]
+        node_source = nearest_source[node]
+        for neighbor in graph.get(node, ()):
+            if not visited[neighbor - lo]:
+                visited[neighbor - lo] = 1
+                distances[neighbor] = node_dist + 1
+                parents[neighbor] = node
+                nearest_source[neighbor] = node_source
+                queue.append(neighbor)
+
+    return {
+        "distances": distances,
+        "parents": parents,
+        "nearest_source": nearest_source,
+        "visited_count": len(distances)
+    }
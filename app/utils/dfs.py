@@ -2,13 +2,39 @@
 DFS (Depth-First Search) Algorithm
 Complejidad: O(V + E)
 """
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def _node_bounds(graph: Dict[int, List[int]], *extra_nodes: int) -> Tuple[int, int]:
+    """
+    Rango [mínimo, máximo] de ids del grafo.
+
+    Los buffers de visitados se indexan con `node - mínimo`: reindexado
+    denso a 0..V-1 que además evita que los ids negativos (el esquema
+    los acepta) aliasen vía el indexado negativo de Python.
+    """
+    lo = min(extra_nodes, default=0)
+    hi = max(extra_nodes, default=0)
+    for u, neighbors in graph.items():
+        if u < lo:
+            lo = u
+        elif u > hi:
+            hi = u
+        for v in neighbors:
+            if v < lo:
+                lo = v
+            elif v > hi:
+                hi = v
+    return lo, hi
 
 
 def dfs(graph: Dict[int, List[int]], start: int) -> Dict[str, any]:
     """
     Ejecuta DFS desde un nodo inicial (iterativo).
 
+    Los visitados van en un bytearray indexado por nodo: membership por
+    índice en lugar de hash+probe de set por consulta.
+
     Args:
         graph: Grafo representado como diccionario de adyacencia
         start: Nodo inicial
@@ -16,86 +42,134 @@ def dfs(graph: Dict[int, List[int]], start: int) -> Dict[str, any]:
     Returns:
         Dict con orden de visita y tiempos
     """
-    visited = set()
+    lo, hi = _node_bounds(graph, start)
+    visited = bytearray(hi - lo + 1)
     stack = [start]
     order = []
 
     while stack:
         node = stack.pop()
-
-        if node not in visited:
-            visited.add(node)
-            order.append(node)
-
-            if node in graph:
-                # Agregar vecinos en orden inverso para mantener orden correcto
-                for neighbor in reversed(graph[node]):
-                    if neighbor not in visited:
-                        stack.append(neighbor)
+        if visited[node - lo]:
+            continue
+        visited[node - lo] = 1
+        order.append(node)
+
+        neighbors = graph.get(node)
+        if neighbors:
+            # Vecinos en orden inverso para mantener el preorden; el
+            # extend corre en C y los ya visitados se filtran al popear
+            # (chequearlos antes de apilar costaba un test por arista)
+            stack.extend(reversed(neighbors))
 
     return {
         "order": order,
-        "visited_count": len(visited)
+        "visited_count": len(order)
     }
 
 
 def dfs_recursive(graph: Dict[int, List[int]], start: int, visited: Optional[Set[int]] = None) -> List[int]:
     """
-    Ejecuta DFS recursivamente.
+    Ejecuta DFS en el orden de la versión recursiva, pero con pila explícita.
+
+    El recorrido produce exactamente el preorden de la recursión sin un
+    frame de llamada por nodo ni techo de RecursionError en caminos
+    largos; los visitados van en un bytearray indexado por nodo.
 
     Args:
         graph: Grafo representado como diccionario de adyacencia
         start: Nodo inicial
-        visited: Set de nodos visitados
+        visited: Set de nodos visitados; se siembra y actualiza si se pasa
 
     Returns:
         Lista con orden de visita
     """
-    if visited is None:
-        visited = set()
+    lo, hi = _node_bounds(graph, start)
+    seen = bytearray(hi - lo + 1)
+    if visited:
+        for node in visited:
+            if lo <= node <= hi:
+                seen[node - lo] = 1
 
-    visited.add(start)
-    order = [start]
-
-    if start in graph:
-        for neighbor in graph[start]:
-            if neighbor not in visited:
-                order.extend(dfs_recursive(graph, neighbor, visited))
+    order = []
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        if seen[node - lo]:
+            continue
+        seen[node - lo] = 1
+        if visited is not None:
+            visited.add(node)
+        order.append(node)
+        neighbors = graph.get(node)
+        if neighbors:
+            # Vecinos en orden inverso: el primero queda arriba de la
+            # pila y se explora a fondo antes que el resto, como recursión
+            stack.extend(reversed(neighbors))
 
     return order
 
 
-def dfs_paths(graph: Dict[int, List[int]], start: int, end: int, path: Optional[List[int]] = None) -> List[List[int]]:
+def iter_dfs_paths(graph: Dict[int, List[int]], start: int, end: int):
     """
-    Encuentra todos los caminos entre dos nodos usando DFS.
+    Genera todos los caminos simples entre dos nodos usando DFS.
+
+    Backtracking con pila explícita de iteradores sobre UN camino
+    compartido: empujar/sacar un nodo es O(1) y la membership va en un
+    bytearray, en vez de copiar el camino (O(L)) y escanearlo linealmente
+    por cada expansión como hacía la versión recursiva. Solo se copia el
+    camino al emitirlo; quien quiera únicamente el primero no paga la
+    enumeración completa.
 
     Args:
         graph: Grafo representado como diccionario de adyacencia
         start: Nodo inicial
         end: Nodo final
-        path: Camino actual (recursivo)
 
-    Returns:
-        Lista de todos los caminos posibles
+    Yields:
+        Cada camino simple de start a end, como lista de nodos
     """
-    if path is None:
-        path = []
-
-    path = path + [start]
+    lo, hi = _node_bounds(graph, start, end)
+    on_path = bytearray(hi - lo + 1)
+    on_path[start - lo] = 1
+    path = [start]
+    stack = [iter(graph.get(start, ()))]
 
     if start == end:
-        return [path]
+        yield [start]
+        # Los caminos simples no repiten nodos: no hay más que emitir
+        return
 
-    if start not in graph:
-        return []
+    while stack:
+        advanced = False
+        for neighbor in stack[-1]:
+            if on_path[neighbor - lo]:
+                continue  # Evitar ciclos
+            if neighbor == end:
+                yield path + [neighbor]
+                continue
+            on_path[neighbor - lo] = 1
+            path.append(neighbor)
+            stack.append(iter(graph.get(neighbor, ())))
+            advanced = True
+            break
+        if not advanced:
+            on_path[path.pop() - lo] = 0
+            stack.pop()
+
+
+def dfs_paths(graph: Dict[int, List[int]], start: int, end: int) -> List[List[int]]:
+    """
+    Encuentra todos los caminos entre dos nodos usando DFS.
 
-    paths = []
-    for neighbor in graph[start]:
-        if neighbor not in path:  # Evitar ciclos
-            new_paths = dfs_paths(graph, neighbor, end, path)
-            paths.extend(new_paths)
+    Args:
+        graph: Grafo representado como diccionario de adyacencia
+        start: Nodo inicial
+        end: Nodo final
 
-    return paths
+    Returns:
+        Lista de todos los caminos posibles
+    """
+    return list(iter_dfs_paths(graph, start, end))
 
 
 def detect_cycle_dfs(graph: Dict[int, List[int]]) -> Dict[str, any]:
@@ -108,39 +182,39 @@ def detect_cycle_dfs(graph: Dict[int, List[int]]) -> Dict[str, any]:
     Returns:
         Dict con has_cycle (bool) y cycle (lista de nodos del ciclo)
     """
-    visited = set()
-    rec_stack = set()
-    path = []
-    cycle_found = []
-
-    def find_cycle(node: int) -> bool:
-        visited.add(node)
-        rec_stack.add(node)
-        path.append(node)
-
-        if node in graph:
-            for neighbor in graph[node]:
-                if neighbor not in visited:
-                    if find_cycle(neighbor):
-                        return True
-                elif neighbor in rec_stack:
+    # Tres colores en un bytearray (0 blanco, 1 gris, 2 negro): un gris
+    # alcanzable de nuevo es una arista de retroceso. Pila explícita de
+    # (nodo, iterador de vecinos) en lugar de recursión: sin techo de
+    # RecursionError en grafos profundos
+    WHITE, GRAY, BLACK = 0, 1, 2
+    lo, hi = _node_bounds(graph)
+    color = bytearray(hi - lo + 1)
+
+    for root in graph:
+        if color[root - lo] != WHITE:
+            continue
+        color[root - lo] = GRAY
+        path = [root]
+        stack = [iter(graph.get(root, ()))]
+        while stack:
+            advanced = False
+            for neighbor in stack[-1]:
+                if color[neighbor - lo] == WHITE:
+                    color[neighbor - lo] = GRAY
+                    path.append(neighbor)
+                    stack.append(iter(graph.get(neighbor, ())))
+                    advanced = True
+                    break
+                if color[neighbor - lo] == GRAY:
                     # Encontramos un ciclo - extraer el ciclo del path
                     cycle_start_idx = path.index(neighbor)
-                    cycle_found.extend(path[cycle_start_idx:])
-                    cycle_found.append(neighbor)  # Cerrar el ciclo
-                    return True
-
-        path.pop()
-        rec_stack.remove(node)
-        return False
-
-    for node in graph:
-        if node not in visited:
-            if find_cycle(node):
-                return {
-                    'has_cycle': True,
-                    'cycle': cycle_found
-                }
+                    return {
+                        'has_cycle': True,
+                        'cycle': path[cycle_start_idx:] + [neighbor]
+                    }
+            if not advanced:
+                color[path.pop() - lo] = BLACK
+                stack.pop()
 
     return {
         'has_cycle': False,
@@ -158,25 +232,35 @@ def topological_sort_dfs(graph: Dict[int, List[int]]) -> Optional[List[int]]:
     Returns:
         Lista con orden topológico o None si hay ciclo
     """
-    cycle_result = detect_cycle_dfs(graph)
-    if cycle_result['has_cycle']:
-        return None
-
-    visited = set()
-    stack = []
-
-    def dfs_util(node: int):
-        visited.add(node)
-
-        if node in graph:
-            for neighbor in graph[node]:
-                if neighbor not in visited:
-                    dfs_util(neighbor)
-
-        stack.append(node)
-
-    for node in graph:
-        if node not in visited:
-            dfs_util(node)
-
-    return stack[::-1]
+    # Una sola pasada: el post-orden se acumula mientras los tres
+    # colores detectan ciclos al vuelo (gris re-alcanzado), en lugar de
+    # correr detect_cycle_dfs y después un segundo DFS completo
+    WHITE, GRAY, BLACK = 0, 1, 2
+    lo, hi = _node_bounds(graph)
+    color = bytearray(hi - lo + 1)
+    post_order = []
+
+    for root in graph:
+        if color[root - lo] != WHITE:
+            continue
+        color[root - lo] = GRAY
+        path = [root]
+        stack = [iter(graph.get(root, ()))]
+        while stack:
+            advanced = False
+            for neighbor in stack[-1]:
+                if color[neighbor - lo] == WHITE:
+                    color[neighbor - lo] = GRAY
+                    path.append(neighbor)
+                    stack.append(iter(graph.get(neighbor, ())))
+                    advanced = True
+                    break
+                if color[neighbor - lo] == GRAY:
+                    return None  # Ciclo: no hay orden topológico
+            if not advanced:
+                node = path.pop()
+                color[node - lo] = BLACK
+                post_order.append(node)
+                stack.pop()
+
+    return post_order[::-1]
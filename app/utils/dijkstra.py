@@ -6,13 +6,16 @@ import heapq
 from typing import Dict, List, Tuple, Optional
 
 
-def dijkstra(graph: Dict[int, List[Tuple[int, float]]], start: int) -> Dict[str, any]:
+def dijkstra(graph: Dict[int, List[Tuple[int, float]]], start: int, skip_stale: bool = True) -> Dict[str, any]:
     """
     Algoritmo de Dijkstra para encontrar caminos más cortos.
 
     Args:
         graph: Grafo representado como {nodo: [(vecino, peso), ...]}
         start: Nodo inicial
+        skip_stale: Descarta al extraer del heap las entradas que otra
+            relajación posterior dejó obsoletas, sin tocar la lógica
+            de relajación
 
     Returns:
         Dict con distancias y padres
@@ -28,6 +31,11 @@ def dijkstra(graph: Dict[int, List[Tuple[int, float]]], start: int) -> Dict[str,
         if current_node in visited:
             continue
 
+        # Entrada obsoleta: el nodo ya tiene una distancia mejor que la
+        # que llevaba esta entrada cuando se encoló
+        if skip_stale and current_dist > distances[current_node]:
+            continue
+
         visited.add(current_node)
 
         if current_node in graph:
@@ -45,7 +53,7 @@ def dijkstra(graph: Dict[int, List[Tuple[int, float]]], start: int) -> Dict[str,
     }
 
 
-def dijkstra_path(graph: Dict[int, List[Tuple[int, float]]], start: int, end: int) -> Optional[Dict[str, any]]:
+def dijkstra_path(graph: Dict[int, List[Tuple[int, float]]], start: int, end: int, skip_stale: bool = True) -> Optional[Dict[str, any]]:
     """
     Encuentra el camino más corto entre dos nodos usando Dijkstra.
 
@@ -53,11 +61,12 @@ def dijkstra_path(graph: Dict[int, List[Tuple[int, float]]], start: int, end: in
         graph: Grafo con pesos
         start: Nodo inicial
         end: Nodo final
+        skip_stale: Ver `dijkstra`
 
     Returns:
         Dict con camino y distancia total, o None si no existe
     """
-    result = dijkstra(graph, start)
+    result = dijkstra(graph, start, skip_stale=skip_stale)
     distances = result["distances"]
     parents = result["parents"]
 
@@ -81,6 +90,40 @@ def dijkstra_path(graph: Dict[int, List[Tuple[int, float]]], start: int, end: in
     }
 
 
+def iter_dijkstra_all_paths(graph: Dict[int, List[Tuple[int, float]]], start: int):
+    """
+    Genera los caminos más cortos desde un nodo, uno por destino.
+
+    A diferencia de `dijkstra_all_paths`, nunca materializa el dict
+    completo de caminos: el pico de memoria es O(V) por camino en vez
+    de O(V²), lo que permite serializar la respuesta en streaming.
+
+    Args:
+        graph: Grafo con pesos
+        start: Nodo inicial
+
+    Yields:
+        Tuplas (nodo_destino, {"path": [...], "distance": d})
+    """
+    result = dijkstra(graph, start)
+    distances = result["distances"]
+    parents = result["parents"]
+
+    for end_node in distances:
+        if end_node == start:
+            yield end_node, {"path": [start], "distance": 0}
+            continue
+
+        path = []
+        current = end_node
+        while current is not None:
+            path.append(current)
+            current = parents.get(current)
+        path.reverse()
+
+        yield end_node, {"path": path, "distance": distances[end_node]}
+
+
 def dijkstra_all_paths(graph: Dict[int, List[Tuple[int, float]]], start: int) -> Dict[int, Dict[str, any]]:
     """
     Encuentra todos los caminos más cortos desde un nodo inicial.
@@ -120,3 +163,150 @@ def dijkstra_all_paths(graph: Dict[int, List[Tuple[int, float]]], start: int) ->
             }
 
     return paths
+
+
+def dijkstra_bidirectional(graph: Dict[int, List[Tuple[int, float]]], start: int, end: int) -> Optional[Dict[str, any]]:
+    """
+    Dijkstra bidireccional para consultas de un solo par (s, t).
+
+    Crece dos frontera a la vez —hacia adelante desde `start` y hacia
+    atrás desde `end` sobre el grafo invertido— y termina cuando la suma
+    de los topes de ambos heaps alcanza el mejor camino visto. En grafos
+    dispersos grandes cada frontera asienta una fracción de los nodos
+    que expandiría el Dijkstra single-source completo.
+
+    Misma complejidad asintótica O((V + E) log V) pero con constantes
+    mucho menores para pares lejanos; usa heapq con descarte de entradas
+    obsoletas, igual que `dijkstra`.
+
+    Args:
+        graph: Grafo con pesos positivos
+        start: Nodo inicial
+        end: Nodo final
+
+    Returns:
+        Dict con camino y distancia total, o None si no existe
+    """
+    if start == end:
+        return {"path": [start], "distance": 0}
+
+    # Adyacencia invertida para la búsqueda hacia atrás
+    reverse: Dict[int, List[Tuple[int, float]]] = {}
+    for u, neighbors in graph.items():
+        for v, w in neighbors:
+            reverse.setdefault(v, []).append((u, w))
+
+    dist_f = {start: 0}
+    dist_b = {end: 0}
+    parents_f: Dict[int, Optional[int]] = {start: None}
+    parents_b: Dict[int, Optional[int]] = {end: None}
+    heap_f = [(0, start)]
+    heap_b = [(0, end)]
+    settled_f = set()
+    settled_b = set()
+
+    best = float('inf')
+    meeting_node = None
+
+    def _expand(heap, dist, parents, settled, other_dist, adj):
+        """Asienta un nodo de esta frontera y relaja sus aristas."""
+        nonlocal best, meeting_node
+        while heap:
+            current_dist, u = heapq.heappop(heap)
+            if u in settled or current_dist > dist[u]:
+                continue
+            settled.add(u)
+            for v, weight in adj.get(u, []):
+                new_dist = current_dist + weight
+                if v not in dist or new_dist < dist[v]:
+                    dist[v] = new_dist
+                    parents[v] = u
+                    heapq.heappush(heap, (new_dist, v))
+                # Arista que cruza a la otra frontera: candidato a camino
+                if v in other_dist and dist[v] + other_dist[v] < best:
+                    best = dist[v] + other_dist[v]
+                    meeting_node = v
+            return
+
+    while heap_f and heap_b:
+        # Condición de parada: ningún camino que pase por los topes
+        # actuales puede mejorar el mejor ya encontrado
+        if heap_f[0][0] + heap_b[0][0] >= best:
+            break
+        # Expandir la frontera con el tope menor equilibra ambos conos
+        if heap_f[0][0] <= heap_b[0][0]:
+            _expand(heap_f, dist_f, parents_f, settled_f, dist_b, graph)
+        else:
+            _expand(heap_b, dist_b, parents_b, settled_b, dist_f, reverse)
+
+    if meeting_node is None:
+        return None
+
+    # Mitad hacia adelante: start → meeting_node
+    path = []
+    current = meeting_node
+    while current is not None:
+        path.append(current)
+        current = parents_f.get(current)
+    path.reverse()
+
+    # Mitad hacia atrás: meeting_node → end (parents_b apunta hacia end)
+    current = parents_b.get(meeting_node)
+    while current is not None:
+        path.append(current)
+        current = parents_b.get(current)
+
+    return {"path": path, "distance": best}
+
+
+def dijkstra_csr(indptr, indices, weights, start: int) -> Dict[str, any]:
+    """
+    Dijkstra sobre un grafo en formato CSR (indptr/indices/weights).
+
+    Misma salida que `dijkstra`, pero el escaneo de aristas recorre
+    arrays contiguos int32/float32 en lugar de tuplas Python: 8 B por
+    arista y acceso prefetchable, sin una dereferencia por vecino.
+
+    Args:
+        indptr: Offsets CSR por nodo (tamaño n+1)
+        indices: Vecinos aplanados
+        weights: Pesos alineados con indices
+        start: Nodo inicial (índice denso)
+
+    Returns:
+        Dict con distancias y padres de los nodos alcanzados
+    """
+    n = len(indptr) - 1
+    if start >= n:
+        # Nodo aislado que no aparece en el grafo
+        return {"distances": {start: 0}, "parents": {start: None}}
+
+    INF = float('inf')
+    dist = [INF] * n
+    parent = [-1] * n
+    settled = bytearray(n)
+    dist[start] = 0.0
+
+    order = []
+    heap = [(0.0, start)]
+    while heap:
+        current_dist, u = heapq.heappop(heap)
+        if settled[u] or current_dist > dist[u]:
+            continue
+        settled[u] = 1
+        order.append(u)
+        for idx in range(indptr[u], indptr[u + 1]):
+            v = int(indices[idx])
+            new_dist = current_dist + float(weights[idx])
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                parent[v] = u
+                heapq.heappush(heap, (new_dist, v))
+
+    return {
+        "distances": {node: dist[node] for node in order},
+        "parents": {
+            node: (parent[node] if parent[node] >= 0 else None)
+            for node in order
+        }
+    }
@@ -4,11 +4,18 @@ Complejidad: O(n * W)
 """
 from typing import List, Tuple, Dict
 
+import numpy as np
+
 
 def knapsack_01(weights: List[int], values: List[int], capacity: int) -> Dict[str, any]:
     """
     Problema de la mochila 0/1 usando programación dinámica.
 
+    La fila DP por item se calcula como un máximo vectorizado sobre la
+    fila anterior (dp[w] = max(dp[w], dp[w-wi] + vi) en un solo
+    np.maximum): el bucle interno sobre capacidades corre en C sobre
+    int64 contiguos en lugar de listas Python.
+
     Args:
         weights: Lista de pesos de los items
         values: Lista de valores de los items
@@ -19,31 +26,36 @@ def knapsack_01(weights: List[int], values: List[int], capacity: int) -> Dict[st
     """
     n = len(weights)
 
-    # Tabla DP: dp[i][w] = máximo valor con i items y capacidad w
-    dp = [[0 for _ in range(capacity + 1)] for _ in range(n + 1)]
-
-    # Llenar tabla DP
-    for i in range(1, n + 1):
-        for w in range(capacity + 1):
-            # No incluir item i-1
-            dp[i][w] = dp[i-1][w]
-
-            # Incluir item i-1 si es posible
-            if weights[i-1] <= w:
-                dp[i][w] = max(dp[i][w], dp[i-1][w - weights[i-1]] + values[i-1])
-
-    # Reconstruir solución
+    # Una sola fila rodante más un bitmap keep[i, w] (¿mejoró el item i
+    # la capacidad w?): bool de 1 byte por celda en vez de snapshots
+    # int64 de la fila completa — 8x menos memoria para reconstruir
+    dp = np.zeros(capacity + 1, dtype=np.int64)
+    keep = np.zeros((n, capacity + 1), dtype=np.bool_)
+    for i in range(n):
+        wi = weights[i]
+        if 0 < wi <= capacity:
+            # El candidato se evalúa completo sobre la fila anterior,
+            # preservando la semántica 0/1 (cada item a lo sumo una vez)
+            cand = dp[:-wi] + values[i]
+            mask = cand > dp[wi:]
+            dp[wi:][mask] = cand[mask]
+            keep[i, wi:][mask] = True
+        elif wi == 0 and values[i] > 0:
+            dp += values[i]
+            keep[i, :] = True
+
+    # Reconstruir solución recorriendo el bitmap hacia atrás
     selected_items = []
     w = capacity
-    for i in range(n, 0, -1):
-        if dp[i][w] != dp[i-1][w]:
-            selected_items.append(i-1)  # Item en índice i-1
-            w -= weights[i-1]
+    for i in range(n - 1, -1, -1):
+        if keep[i, w]:
+            selected_items.append(i)
+            w -= weights[i]
 
     selected_items.reverse()
 
     return {
-        "max_value": dp[n][capacity],
+        "max_value": int(dp[capacity]),
         "selected_items": selected_items,
         "selected_weights": [weights[i] for i in selected_items],
         "selected_values": [values[i] for i in selected_items],
@@ -55,6 +67,11 @@ def knapsack_unbounded(weights: List[int], values: List[int], capacity: int) ->
     """
     Problema de la mochila sin límite (unbounded knapsack).
 
+    Cada item ilimitado se parte en copias binarias (1, 2, 4, ... hasta
+    capacity // wi) y cada copia se aplica como una actualización 0/1
+    vectorizada sobre la fila DP: O(log(W/wi)) pasadas np.maximum por
+    item en C, en lugar de un paso Python por capacidad.
+
     Args:
         weights: Lista de pesos de los items
         values: Lista de valores de los items
@@ -63,15 +80,24 @@ def knapsack_unbounded(weights: List[int], values: List[int], capacity: int) ->
     Returns:
         Dict con valor máximo
     """
-    dp = [0] * (capacity + 1)
-
-    for w in range(1, capacity + 1):
-        for i in range(len(weights)):
-            if weights[i] <= w:
-                dp[w] = max(dp[w], dp[w - weights[i]] + values[i])
+    dp = np.zeros(capacity + 1, dtype=np.int64)
+
+    for wi, vi in zip(weights, values):
+        if wi <= 0 or wi > capacity:
+            continue
+        # Descomposición binaria: tomar el item k veces equivale a tomar
+        # a lo sumo una vez cada copia de tamaño 1, 2, 4, ..., resto
+        remaining = capacity // wi
+        k = 1
+        while remaining > 0:
+            take = min(k, remaining)
+            w_step = wi * take
+            dp[w_step:] = np.maximum(dp[w_step:], dp[:-w_step] + vi * take)
+            remaining -= take
+            k <<= 1
 
     return {
-        "max_value": dp[capacity]
+        "max_value": int(dp[capacity])
     }
 
 
@@ -79,6 +105,12 @@ def knapsack_fractional(weights: List[float], values: List[float], capacity: flo
     """
     Problema de la mochila fraccionaria (Greedy).
 
+    El greedy completo se expresa con kernels NumPy: argsort por ratio
+    valor/peso, cumsum de pesos en ese orden y un searchsorted que ubica
+    el corte de capacidad. Los items antes del corte van completos en un
+    solo assignment vectorizado; solo el item del corte (si existe) toma
+    fracción. Sin bucle Python por item ni tuplas intermedias.
+
     Args:
         weights: Lista de pesos
         values: Lista de valores
@@ -88,32 +120,37 @@ def knapsack_fractional(weights: List[float], values: List[float], capacity: flo
         Dict con valor máximo y fracciones
     """
     n = len(weights)
-
-    # Calcular valor/peso y ordenar
-    items = [(values[i] / weights[i], weights[i], values[i], i) for i in range(n)]
-    items.sort(reverse=True, key=lambda x: x[0])
-
-    total_value = 0.0
-    fractions = [0.0] * n
-    remaining_capacity = capacity
-
-    for ratio, weight, value, idx in items:
-        if remaining_capacity >= weight:
-            # Tomar todo el item
-            fractions[idx] = 1.0
-            total_value += value
-            remaining_capacity -= weight
-        else:
-            # Tomar fracción
-            fraction = remaining_capacity / weight
+    fractions = np.zeros(n, dtype=np.float64)
+    if n == 0:
+        return {"max_value": 0.0, "fractions": []}
+
+    w_arr = np.asarray(weights, dtype=np.float64)
+    v_arr = np.asarray(values, dtype=np.float64)
+
+    # Orden descendente por ratio; el sort estable preserva el orden de
+    # entrada entre ratios iguales, como el sort de listas anterior
+    order = np.argsort(-(v_arr / w_arr), kind="stable")
+
+    # cumsum de pesos en orden greedy: el prefijo que entra completo es
+    # todo lo anterior al punto de inserción de capacity
+    cum_w = np.cumsum(w_arr[order])
+    cut = int(np.searchsorted(cum_w, capacity, side="right"))
+
+    full = order[:cut]
+    fractions[full] = 1.0
+    total_value = float(v_arr[full].sum())
+
+    if cut < n:
+        remaining = capacity - (cum_w[cut - 1] if cut > 0 else 0.0)
+        if remaining > 0:
+            idx = order[cut]
+            fraction = remaining / w_arr[idx]
             fractions[idx] = fraction
-            total_value += value * fraction
-            remaining_capacity = 0
-            break
+            total_value += float(v_arr[idx]) * fraction
 
     return {
         "max_value": total_value,
-        "fractions": fractions
+        "fractions": fractions.tolist()
     }
 
 
@@ -129,32 +166,33 @@ def subset_sum(numbers: List[int], target: int) -> Dict[str, any]:
         Dict indicando si es posible y el subconjunto
     """
     n = len(numbers)
-    dp = [[False for _ in range(target + 1)] for _ in range(n + 1)]
-
-    # Suma 0 siempre es posible
-    for i in range(n + 1):
-        dp[i][0] = True
-
-    for i in range(1, n + 1):
-        for s in range(target + 1):
-            dp[i][s] = dp[i-1][s]
-
-            if numbers[i-1] <= s:
-                dp[i][s] = dp[i][s] or dp[i-1][s - numbers[i-1]]
 
-    # Reconstruir subconjunto
-    if not dp[n][target]:
+    # DP de alcanzabilidad como bitmask (SWAR): el bit s de reach indica
+    # que la suma s es alcanzable. El shift/OR de enteros grandes corre en
+    # C sobre limbs de 64 bits — 64 estados por operación de máquina en
+    # lugar de una fila de booleans por elemento.
+    mask = (1 << (target + 1)) - 1
+    reach = 1  # suma 0 siempre es posible
+    prefix_reach = [reach]  # snapshot por item para reconstruir
+    for num in numbers:
+        if 0 < num <= target:
+            reach = (reach | (reach << num)) & mask
+        prefix_reach.append(reach)
+
+    if not (reach >> target) & 1:
         return {
             "is_possible": False,
             "subset": []
         }
 
+    # Reconstruir subconjunto con los snapshots de prefijo
     subset = []
     s = target
     for i in range(n, 0, -1):
-        if s >= numbers[i-1] and dp[i-1][s - numbers[i-1]]:
-            subset.append(numbers[i-1])
-            s -= numbers[i-1]
+        num = numbers[i-1]
+        if 0 < num <= s and (prefix_reach[i-1] >> (s - num)) & 1:
+            subset.append(num)
+            s -= num
 
     return {
         "is_possible": True,
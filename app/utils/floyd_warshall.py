@@ -2,8 +2,32 @@
 Floyd-Warshall Algorithm - Todos los pares de caminos más cortos
 Complejidad: O(V^3)
 """
+import os
+import tempfile
 from typing import Dict, List, Tuple, Optional
 
+import numpy as np
+
+# A partir de este V las matrices dist/next (float32/int32, V×V cada una)
+# se respaldan en archivos mmap en vez de RAM: 5000 nodos ya son ~200 MB
+_FW_MEMMAP_THRESHOLD = int(os.getenv("FW_MEMMAP_THRESHOLD", "4096"))
+
+
+def _memmap_matrix(shape: Tuple[int, int], dtype, tag: str) -> np.ndarray:
+    """
+    Crea una matriz respaldada por mmap en tmpfs (o el tmp del sistema).
+
+    El archivo se desvincula inmediatamente: el mapeo lo mantiene vivo y
+    el kernel libera las páginas cuando el array muere, sin archivos
+    huérfanos si el proceso cae.
+    """
+    tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    fd, path = tempfile.mkstemp(prefix=f"fw_{tag}_", dir=tmp_dir)
+    os.close(fd)
+    matrix = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+    os.unlink(path)
+    return matrix
+
 
 def floyd_warshall(graph: Dict[int, List[Tuple[int, float]]], num_vertices: int) -> Dict[str, any]:
     """
@@ -16,32 +40,108 @@ def floyd_warshall(graph: Dict[int, List[Tuple[int, float]]], num_vertices: int)
     Returns:
         Dict con matriz de distancias y siguiente nodo en el camino
     """
-    # Inicializar matrices
-    INF = float('inf')
-    dist = [[INF for _ in range(num_vertices)] for _ in range(num_vertices)]
-    next_node = [[None for _ in range(num_vertices)] for _ in range(num_vertices)]
+    # El cubo O(V³) corre en el kernel NumPy (min-plus por broadcast,
+    # ver floyd_warshall_arrays); aquí solo se traduce de vuelta a la
+    # forma histórica de listas con None para "sin camino"
+    dist, next_node = floyd_warshall_arrays(graph, num_vertices)
 
-    # Distancia de un nodo a sí mismo es 0
-    for i in range(num_vertices):
-        dist[i][i] = 0
+    return {
+        "distances": dist.tolist(),
+        "next": [
+            [int(v) if v >= 0 else None for v in row] for row in next_node
+        ]
+    }
+
+
+def floyd_warshall_arrays(graph: Dict[int, List[Tuple[int, float]]], num_vertices: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Kernel de Floyd-Warshall vectorizado que devuelve los ndarrays crudos.
+
+    Los llamadores que serializan por filas (streaming) o consultan
+    entradas puntuales evitan así materializar las listas Python V×V.
+
+    Args:
+        graph: Grafo representado como {nodo: [(vecino, peso), ...]}
+        num_vertices: Número total de vértices; se deriva del grafo si se omite
+
+    Returns:
+        Tupla (dist, next_node) como arrays float32/int32; -1 en
+        next_node significa "sin camino".
+    """
+    if num_vertices is None:
+        num_vertices = 0
+        for u, neighbors in graph.items():
+            num_vertices = max(num_vertices, u + 1)
+            for v, _ in neighbors:
+                num_vertices = max(num_vertices, v + 1)
+
+    # float32: la matriz V×V pesa la mitad y el kernel min-plus, limitado
+    # por ancho de banda, procesa el doble de entradas por línea de caché
+    use_memmap = num_vertices >= _FW_MEMMAP_THRESHOLD
+    if use_memmap:
+        dist = _memmap_matrix((num_vertices, num_vertices), np.float32, "dist")
+        dist[:] = np.inf
+        next_node = _memmap_matrix((num_vertices, num_vertices), np.int32, "next")
+        next_node[:] = -1
+    else:
+        dist = np.full((num_vertices, num_vertices), np.inf, dtype=np.float32)
+        next_node = np.full((num_vertices, num_vertices), -1, dtype=np.int32)
+    np.fill_diagonal(dist, 0.0)
 
-    # Inicializar con aristas del grafo
     for u in graph:
         for v, weight in graph[u]:
-            dist[u][v] = weight
-            next_node[u][v] = v
+            dist[u, v] = weight
+            next_node[u, v] = v
+
+    if use_memmap:
+        # Actualización in-place por bloques de filas: los temporales por
+        # iteración quedan acotados a block×V y las escrituras van directo
+        # a las páginas mapeadas, así el RSS no crece con V²
+        block = max(1, (64 << 20) // (4 * num_vertices))
+        for k in range(num_vertices):
+            row_k = np.array(dist[k, :])
+            for i0 in range(0, num_vertices, block):
+                i1 = min(i0 + block, num_vertices)
+                via_k = dist[i0:i1, k:k + 1] + row_k
+                improved = via_k < dist[i0:i1, :]
+                dist[i0:i1, :][improved] = via_k[improved]
+                next_node[i0:i1, :][improved] = np.broadcast_to(
+                    next_node[i0:i1, k:k + 1], improved.shape
+                )[improved]
+    else:
+        for k in range(num_vertices):
+            # dist[i,k] + dist[k,j] para todos los pares de una vez
+            via_k = dist[:, k:k + 1] + dist[k:k + 1, :]
+            improved = via_k < dist
+            dist = np.where(improved, via_k, dist)
+            next_node = np.where(
+                improved, np.broadcast_to(next_node[:, k:k + 1], improved.shape), next_node
+            )
+
+    return dist, next_node
+
+
+def floyd_warshall_numpy(graph: Dict[int, List[Tuple[int, float]]], num_vertices: Optional[int] = None) -> Dict[str, any]:
+    """
+    Floyd-Warshall vectorizado: el bucle interno i,j corre como min-plus
+    NumPy por cada k, en C sobre la matriz contigua en lugar del triple
+    bucle Python.
 
-    # Floyd-Warshall
-    for k in range(num_vertices):
-        for i in range(num_vertices):
-            for j in range(num_vertices):
-                if dist[i][k] + dist[k][j] < dist[i][j]:
-                    dist[i][j] = dist[i][k] + dist[k][j]
-                    next_node[i][j] = next_node[i][k]
+    Args:
+        graph: Grafo representado como {nodo: [(vecino, peso), ...]}
+        num_vertices: Número total de vértices; se deriva del grafo si se omite
 
+    Returns:
+        Dict con matriz de distancias y siguiente nodo en el camino
+    """
+    dist, next_node = floyd_warshall_arrays(graph, num_vertices)
+
+    next_as_lists = [
+        [int(v) if v >= 0 else None for v in row] for row in next_node
+    ]
     return {
-        "distances": dist,
-        "next": next_node
+        "distances": dist.tolist(),
+        "next": next_as_lists
     }
 
 
@@ -5,9 +5,11 @@ GC: Grafo de Categorías
 GUC: Grafo de Usuario-Categoría
 """
 from typing import List, Dict, Tuple
-from datetime import date
+from datetime import date, datetime
 from collections import defaultdict
 
+from app.utils.graph_stats import graph_to_edge_arrays, degree_counts, count_components
+
 
 class GraphBuilder:
     """Constructor de grafos a partir de transacciones financieras."""
@@ -29,19 +31,18 @@ class GraphBuilder:
         # Ordenar por usuario y fecha
         sorted_trans = sorted(transactions, key=lambda x: (x.get('usuario', ''), x.get('fecha', date.min)))
 
-        # Agrupar por usuario
-        user_trans = defaultdict(list)
-        for trans in sorted_trans:
-            user_trans[trans.get('usuario', '')].append(trans)
-
-        # Crear aristas entre transacciones consecutivas
-        for usuario, trans_list in user_trans.items():
-            for i in range(len(trans_list) - 1):
-                current_id = trans_list[i].get('id', i)
-                next_id = trans_list[i + 1].get('id', i + 1)
-                weight = abs(trans_list[i + 1].get('monto', 0))
+        # Ya ordenado por (usuario, fecha), las transacciones de cada
+        # usuario quedan adyacentes: un solo recorrido de pares
+        # consecutivos reemplaza el reagrupado en listas por usuario
+        for i in range(len(sorted_trans) - 1):
+            current, nxt = sorted_trans[i], sorted_trans[i + 1]
+            if current.get('usuario', '') != nxt.get('usuario', ''):
+                continue
+            current_id = current.get('id', i)
+            next_id = nxt.get('id', i + 1)
+            weight = abs(nxt.get('monto', 0))
 
-                graph[current_id].append((next_id, weight))
+            graph[current_id].append((next_id, weight))
 
         return dict(graph)
 
@@ -58,37 +59,32 @@ class GraphBuilder:
             Grafo no dirigido con pesos (frecuencia y monto)
         """
         graph = defaultdict(list)
-        category_pairs = defaultdict(lambda: {'count': 0, 'total_amount': 0})
+        # Por par (ordenado) de categorías: [conteo, monto acumulado]
+        category_pairs = defaultdict(lambda: [0, 0.0])
 
         # Ordenar por usuario y fecha
         sorted_trans = sorted(transactions, key=lambda x: (x.get('usuario', ''), x.get('fecha', date.min)))
 
-        # Agrupar por usuario
-        user_trans = defaultdict(list)
-        for trans in sorted_trans:
-            user_trans[trans.get('usuario', '')].append(trans)
-
-        # Encontrar transiciones entre categorías
-        for usuario, trans_list in user_trans.items():
-            for i in range(len(trans_list) - 1):
-                cat1 = trans_list[i].get('categoria', 'Unknown')
-                cat2 = trans_list[i + 1].get('categoria', 'Unknown')
-
-                if cat1 != cat2:
-                    pair = tuple(sorted([cat1, cat2]))
-                    category_pairs[pair]['count'] += 1
-                    category_pairs[pair]['total_amount'] += trans_list[i + 1].get('monto', 0)
-
-        # Construir grafo
-        added_edges = set()
-        for (cat1, cat2), data in category_pairs.items():
-            weight = data['total_amount'] / data['count']  # Promedio
-
-            if (cat1, cat2) not in added_edges:
-                graph[cat1].append((cat2, weight))
-                graph[cat2].append((cat1, weight))
-                added_edges.add((cat1, cat2))
-                added_edges.add((cat2, cat1))
+        # Transiciones entre pares consecutivos del mismo usuario, en un
+        # solo recorrido del orden (usuario, fecha) sin reagrupar
+        for i in range(len(sorted_trans) - 1):
+            current, nxt = sorted_trans[i], sorted_trans[i + 1]
+            if current.get('usuario', '') != nxt.get('usuario', ''):
+                continue
+            cat1 = current.get('categoria', 'Unknown')
+            cat2 = nxt.get('categoria', 'Unknown')
+
+            if cat1 != cat2:
+                pair = (cat1, cat2) if cat1 < cat2 else (cat2, cat1)
+                data = category_pairs[pair]
+                data[0] += 1
+                data[1] += nxt.get('monto', 0)
+
+        # Construir grafo (los pares del dict ya son únicos)
+        for (cat1, cat2), (count, total_amount) in category_pairs.items():
+            weight = total_amount / count  # Promedio
+            graph[cat1].append((cat2, weight))
+            graph[cat2].append((cat1, weight))
 
         return dict(graph)
 
@@ -115,14 +111,10 @@ class GraphBuilder:
 
             user_category_amount[(usuario, categoria)] += monto
 
-        # Construir grafo bipartito
-        added_edges = set()
+        # Construir grafo bipartito (los pares del dict ya son únicos)
         for (usuario, categoria), monto in user_category_amount.items():
-            if (usuario, categoria) not in added_edges:
-                graph[usuario].append((categoria, monto))
-                graph[categoria].append((usuario, monto))
-                added_edges.add((usuario, categoria))
-                added_edges.add((categoria, usuario))
+            graph[usuario].append((categoria, monto))
+            graph[categoria].append((usuario, monto))
 
         return dict(graph)
 
@@ -140,30 +132,33 @@ class GraphBuilder:
         """
         graph = defaultdict(list)
 
-        sorted_trans = sorted(transactions, key=lambda x: x.get('fecha', date.min))
-
-        for i, trans1 in enumerate(sorted_trans):
-            for trans2 in sorted_trans[i + 1:]:
-                fecha1 = trans1.get('fecha', date.min)
-                fecha2 = trans2.get('fecha', date.min)
-
-                if isinstance(fecha1, str):
-                    from datetime import datetime
-                    fecha1 = datetime.strptime(fecha1, '%Y-%m-%d').date()
-                if isinstance(fecha2, str):
-                    from datetime import datetime
-                    fecha2 = datetime.strptime(fecha2, '%Y-%m-%d').date()
-
-                days_diff = abs((fecha2 - fecha1).days)
-
-                if days_diff <= time_window_days:
-                    id1 = trans1.get('id', i)
-                    id2 = trans2.get('id', i + 1)
-                    weight = trans2.get('monto', 0)
-
-                    graph[id1].append((id2, weight))
-                else:
-                    break  # Ya están ordenados, no hay más dentro de la ventana
+        # Normalizar fechas una sola vez a ordinales enteros: el strptime
+        # por par del bucle interno se vuelve O(N), y la resta de días es
+        # una resta de ints. Ordenar por el ordinal también evita comparar
+        # str contra date en entradas mixtas.
+        rows = []
+        for idx, trans in enumerate(transactions):
+            fecha = trans.get('fecha', date.min)
+            if isinstance(fecha, str):
+                fecha = datetime.strptime(fecha, '%Y-%m-%d').date()
+            rows.append((fecha.toordinal(), trans.get('id', idx),
+                         trans.get('monto', 0)))
+        rows.sort()
+
+        # Dos punteros sobre la lista ordenada: hi solo avanza, así que
+        # encontrar el borde de la ventana es O(N) amortizado y solo se
+        # recorren los pares que efectivamente quedan dentro
+        n = len(rows)
+        hi = 0
+        for i in range(n):
+            day_i, id_i, _ = rows[i]
+            if hi < i + 1:
+                hi = i + 1
+            limit = day_i + time_window_days
+            while hi < n and rows[hi][0] <= limit:
+                hi += 1
+            for j in range(i + 1, hi):
+                graph[id_i].append((rows[j][1], rows[j][2]))
 
         return dict(graph)
 
@@ -183,18 +178,16 @@ class GraphBuilder:
 
         sorted_trans = sorted(transactions, key=lambda x: (x.get('usuario', ''), x.get('fecha', date.min)))
 
-        user_trans = defaultdict(list)
-        for trans in sorted_trans:
-            user_trans[trans.get('usuario', '')].append(trans)
+        # Contar transiciones entre pares consecutivos del mismo usuario
+        for i in range(len(sorted_trans) - 1):
+            current, nxt = sorted_trans[i], sorted_trans[i + 1]
+            if current.get('usuario', '') != nxt.get('usuario', ''):
+                continue
+            cat1 = current.get('categoria', 'Unknown')
+            cat2 = nxt.get('categoria', 'Unknown')
 
-        # Contar transiciones
-        for usuario, trans_list in user_trans.items():
-            for i in range(len(trans_list) - 1):
-                cat1 = trans_list[i].get('categoria', 'Unknown')
-                cat2 = trans_list[i + 1].get('categoria', 'Unknown')
-
-                if cat1 != cat2:
-                    transitions[(cat1, cat2)] += 1
+            if cat1 != cat2:
+                transitions[(cat1, cat2)] += 1
 
         # Construir grafo dirigido
         for (cat1, cat2), count in transitions.items():
@@ -207,6 +200,10 @@ class GraphBuilder:
         """
         Obtiene estadísticas del grafo.
 
+        La adyacencia se aplana una vez a arrays src/dst/w y los
+        agregados (pesos, grados, componentes) salen de kernels NumPy
+        sobre esos arrays en vez de recorrer el dict varias veces.
+
         Args:
             graph: Grafo
 
@@ -214,18 +211,22 @@ class GraphBuilder:
             Dict con estadísticas
         """
         num_nodes = len(graph)
-        num_edges = sum(len(neighbors) for neighbors in graph.values())
+        src, dst, w, total_nodes = graph_to_edge_arrays(graph)
+        num_edges = int(src.size)
 
-        weights = []
-        for neighbors in graph.values():
-            for neighbor, weight in neighbors:
-                weights.append(weight)
+        out_degree, _ = degree_counts(src, dst, total_nodes)
 
         return {
             "num_nodes": num_nodes,
             "num_edges": num_edges,
             "avg_degree": num_edges / num_nodes if num_nodes > 0 else 0,
-            "avg_weight": sum(weights) / len(weights) if weights else 0,
-            "max_weight": max(weights) if weights else 0,
-            "min_weight": min(weights) if weights else 0
+            "avg_weight": float(w.mean()) if num_edges > 0 else 0,
+            "max_weight": float(w.max()) if num_edges > 0 else 0,
+            "min_weight": float(w.min()) if num_edges > 0 else 0,
+            "max_degree": int(out_degree.max()) if total_nodes > 0 else 0,
+            "density": (
+                num_edges / (total_nodes * (total_nodes - 1))
+                if total_nodes > 1 else 0
+            ),
+            "num_connected_components": count_components(src, dst, total_nodes)
         }
@@ -0,0 +1,83 @@
+"""
+Graph CSR - Conversión de adyacencia dict a formato CSR (SoA)
+Los algoritmos recorren así arrays contiguos int32/float32 en lugar de
+dict/list/tuple con un PyObject por arista.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def to_csr(graph: Dict[int, List[Tuple[int, float]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[int], Dict[int, int]]:
+    """
+    Convierte un grafo ponderado {nodo: [(vecino, peso), ...]} a CSR.
+
+    Las etiquetas de nodo pueden ser enteros arbitrarios (negativos, con
+    huecos): se reindexan a 0..n-1 una sola vez y los algoritmos operan
+    sobre índices densos.
+
+    Args:
+        graph: Grafo ponderado como dict de adyacencia
+
+    Returns:
+        Tupla (indptr, indices, weights, node_of, idx_of):
+        - indptr int32 (n+1), indices int32, weights float32
+        - node_of[i] devuelve la etiqueta original del índice i
+        - idx_of mapea etiqueta original -> índice denso
+    """
+    idx_of: Dict[int, int] = {}
+    for u, neighbors in graph.items():
+        if u not in idx_of:
+            idx_of[u] = len(idx_of)
+        for v, _ in neighbors:
+            if v not in idx_of:
+                idx_of[v] = len(idx_of)
+
+    n = len(idx_of)
+    node_of = [0] * n
+    for node, i in idx_of.items():
+        node_of[i] = node
+
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    for u, neighbors in graph.items():
+        indptr[idx_of[u] + 1] = len(neighbors)
+    np.cumsum(indptr, out=indptr)
+
+    num_edges = int(indptr[-1])
+    indices = np.empty(num_edges, dtype=np.int32)
+    weights = np.empty(num_edges, dtype=np.float32)
+    for u, neighbors in graph.items():
+        offset = int(indptr[idx_of[u]])
+        for i, (v, w) in enumerate(neighbors):
+            indices[offset + i] = idx_of[v]
+            weights[offset + i] = w
+
+    return indptr, indices, weights, node_of, idx_of
+
+
+def edges_to_csr(u: np.ndarray, v: np.ndarray, w: Optional[np.ndarray], num_nodes: int) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Construye CSR desde arrays paralelos de aristas (u, v, w) ya planos.
+
+    Pensado para los requests que validan el grafo a SoA (ver
+    WeightedGraphRequest): todo el armado es vectorizado — bincount +
+    cumsum + un argsort estable — sin bucle Python por arista.
+
+    Args:
+        u: Nodos origen (no negativos, < num_nodes)
+        v: Nodos destino
+        w: Pesos, o None para grafos sin pesos
+        num_nodes: Número de nodos del grafo
+
+    Returns:
+        Tupla (indptr, indices, weights) con weights None si w es None
+    """
+    counts = np.bincount(u, minlength=num_nodes)
+    indptr = np.zeros(num_nodes + 1, dtype=np.int32)
+    np.cumsum(counts, out=indptr[1:])
+
+    order = np.argsort(u, kind='stable')
+    indices = np.ascontiguousarray(v[order], dtype=np.int32)
+    weights = None if w is None else np.ascontiguousarray(w[order], dtype=np.float32)
+
+    return indptr, indices, weights
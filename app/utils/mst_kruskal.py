@@ -3,6 +3,9 @@ Kruskal's Algorithm - Minimum Spanning Tree
 Complejidad: O(E log E)
 """
 from typing import List, Tuple, Dict
+
+import numpy as np
+
 from app.utils.union_find import UnionFind
 
 
@@ -42,6 +45,50 @@ def kruskal(edges: List[Tuple[int, int, float]], num_vertices: int) -> Dict[str,
     }
 
 
+def kruskal_soa(u: np.ndarray, v: np.ndarray, w: np.ndarray, num_vertices: int) -> Dict[str, any]:
+    """
+    Kruskal sobre aristas en arrays paralelos u/v/w (SoA).
+
+    El ordenamiento por peso es un np.argsort sobre el array float32 —
+    introsort en C sobre 4 B por arista — en lugar de un Timsort de
+    tuplas Python con lambda por comparación.
+
+    Args:
+        u: Nodos origen (int32)
+        v: Nodos destino (int32)
+        w: Pesos (float32)
+        num_vertices: Número de vértices
+
+    Returns:
+        Dict con aristas del MST y peso total (misma forma que kruskal)
+    """
+    # stable preserva el orden de llegada en empates, como sorted()
+    order = np.argsort(w, kind="stable")
+
+    uf = UnionFind(num_vertices)
+    mst_edges = []
+    total_weight = 0
+
+    for idx in order:
+        a = int(u[idx])
+        b = int(v[idx])
+        if uf.union(a, b):
+            weight = float(w[idx])
+            mst_edges.append((a, b, weight))
+            total_weight += weight
+
+            # MST completo cuando tenemos V-1 aristas
+            if len(mst_edges) == num_vertices - 1:
+                break
+
+    return {
+        "mst_edges": mst_edges,
+        "total_weight": total_weight,
+        "num_edges": len(mst_edges),
+        "is_connected": len(mst_edges) == num_vertices - 1
+    }
+
+
 def kruskal_from_graph(graph: Dict[int, List[Tuple[int, float]]], num_vertices: int) -> Dict[str, any]:
     """
     Kruskal desde representación de grafo.
@@ -53,16 +100,17 @@ def kruskal_from_graph(graph: Dict[int, List[Tuple[int, float]]], num_vertices:
     Returns:
         Dict con información del MST
     """
-    # Convertir grafo a lista de aristas
+    # Convertir grafo a lista de aristas; el par canónico sale de una
+    # comparación en lugar de list + sorted + tuple por arista
     edges = []
     seen = set()
 
     for u in graph:
         for v, weight in graph[u]:
             # Evitar duplicados en grafo no dirigido
-            edge = tuple(sorted([u, v])) + (weight,)
-            if edge[:2] not in seen:
-                seen.add(edge[:2])
-                edges.append(edge)
+            pair = (u, v) if u < v else (v, u)
+            if pair not in seen:
+                seen.add(pair)
+                edges.append(pair + (weight,))
 
     return kruskal(edges, num_vertices)
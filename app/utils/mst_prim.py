@@ -49,6 +49,64 @@ def prim(graph: Dict[int, List[Tuple[int, float]]], start: int = 0) -> Dict[str,
     }
 
 
+def prim_csr(indptr, indices, weights, start: int = 0) -> Dict[str, any]:
+    """
+    Prim sobre un grafo en formato CSR (indptr/indices/weights).
+
+    Misma salida que `prim`, pero el escaneo de vecinos recorre arrays
+    contiguos int32/float32 en lugar de tuplas Python, y los visitados
+    van en un bytearray indexado por nodo (ver `dijkstra_csr`).
+
+    Args:
+        indptr: Offsets CSR por nodo (tamaño n+1)
+        indices: Vecinos aplanados
+        weights: Pesos alineados con indices
+        start: Nodo inicial (índice denso)
+
+    Returns:
+        Dict con aristas del MST y peso total (misma forma que prim)
+    """
+    n = len(indptr) - 1
+    if start >= n:
+        # Nodo aislado que no aparece en el grafo
+        return {
+            "mst_edges": [],
+            "total_weight": 0,
+            "num_edges": 0,
+            "visited_nodes": 1
+        }
+
+    visited = bytearray(n)
+    mst_edges = []
+    total_weight = 0
+
+    # Min heap: (peso, nodo_actual, nodo_padre); -1 marca la raíz
+    heap = [(0.0, start, -1)]
+
+    while heap:
+        weight, node, parent = heapq.heappop(heap)
+
+        if visited[node]:
+            continue
+        visited[node] = 1
+
+        if parent >= 0:
+            mst_edges.append((parent, node, weight))
+            total_weight += weight
+
+        for idx in range(indptr[node], indptr[node + 1]):
+            neighbor = int(indices[idx])
+            if not visited[neighbor]:
+                heapq.heappush(heap, (float(weights[idx]), neighbor, node))
+
+    return {
+        "mst_edges": mst_edges,
+        "total_weight": total_weight,
+        "num_edges": len(mst_edges),
+        "visited_nodes": len(mst_edges) + 1
+    }
+
+
 def prim_all_components(graph: Dict[int, List[Tuple[int, float]]], num_vertices: int) -> Dict[str, any]:
     """
     Ejecuta Prim en todas las componentes conexas.
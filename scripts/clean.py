@@ -4,60 +4,87 @@ Ejecutar: python scripts/clean.py
 """
 import os
 import shutil
+import sys
 from pathlib import Path
 
+# Patrones a limpiar, precompilados por tipo de chequeo: nombre exacto de
+# directorio, nombre exacto de archivo, o sufijo de archivo (los globs
+# *.ext solo difieren en la extensión)
+DIR_NAMES = frozenset({
+    '__pycache__', '.pytest_cache', '.mypy_cache',
+    'htmlcov', '.tox', '.hypothesis',
+})
+FILE_NAMES = frozenset({'.coverage', 'coverage.xml', '.DS_Store'})
+FILE_SUFFIXES = ('.pyc', '.pyo', '.pyd', '.log', '.tmp')
+
+# Directorios en los que no se desciende: recorrer un virtualenv o .git
+# entero solo para rechazar cada archivo es el mayor costo de I/O del
+# script (site-packages trae decenas de miles de .pyc)
+PRUNE_DIRS = frozenset({'.venv', 'venv', '.git', 'node_modules'})
+
+
+def _clean_dir(path: str, cleaned: list):
+    """
+    Recorre un directorio con os.scandir y limpia entradas que coincidan.
+
+    Una sola pasada por el árbol clasifica cada entrada contra todos los
+    patrones a la vez; DirEntry trae el tipo desde getdents64, así que no
+    hay stat() extra por archivo como con rglob + is_dir()/is_file() por
+    patrón. Los directorios que coinciden se borran completos sin
+    recursar en ellos; los directorios de PRUNE_DIRS se podan antes de
+    descender.
+
+    `cleaned` acumula tuplas (icono, ruta absoluta): el formateo a ruta
+    relativa se difiere a los <= 20 items que efectivamente se muestran.
+    """
+    try:
+        entries = list(os.scandir(path))
+    except OSError as e:
+        print(f"❌ Error leyendo {path}: {e}")
+        return
+
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name in PRUNE_DIRS:
+                continue
+            if entry.name in DIR_NAMES:
+                try:
+                    shutil.rmtree(entry.path)
+                    cleaned.append(('📁', entry.path))
+                except Exception as e:
+                    print(f"❌ Error eliminando {entry.path}: {e}")
+            else:
+                _clean_dir(entry.path, cleaned)
+        elif entry.is_file(follow_symlinks=False):
+            if entry.name in FILE_NAMES or entry.name.endswith(FILE_SUFFIXES):
+                try:
+                    os.unlink(entry.path)
+                    cleaned.append(('📄', entry.path))
+                except Exception as e:
+                    print(f"❌ Error eliminando {entry.path}: {e}")
+
 
 def clean_project():
     """Limpia archivos temporales y cache del proyecto."""
-    root = Path(__file__).parent.parent
+    root = str(Path(__file__).parent.parent)
     cleaned = []
 
-    # Patrones a limpiar
-    patterns = {
-        '__pycache__': 'directories',
-        '*.pyc': 'files',
-        '*.pyo': 'files',
-        '*.pyd': 'files',
-        '.pytest_cache': 'directories',
-        '.mypy_cache': 'directories',
-        '.coverage': 'files',
-        'coverage.xml': 'files',
-        'htmlcov': 'directories',
-        '.tox': 'directories',
-        '.hypothesis': 'directories',
-        '*.log': 'files',
-        '*.tmp': 'files',
-        '.DS_Store': 'files',
-    }
-
     print("🧹 Iniciando limpieza del proyecto...\n")
 
-    # Limpiar directorios
-    for pattern, item_type in patterns.items():
-        if item_type == 'directories':
-            for item in root.rglob(pattern):
-                if item.is_dir() and '.venv' not in str(item):
-                    try:
-                        shutil.rmtree(item)
-                        cleaned.append(f"📁 {item.relative_to(root)}")
-                    except Exception as e:
-                        print(f"❌ Error eliminando {item}: {e}")
-
-        elif item_type == 'files':
-            for item in root.rglob(pattern):
-                if item.is_file() and '.venv' not in str(item):
-                    try:
-                        item.unlink()
-                        cleaned.append(f"📄 {item.relative_to(root)}")
-                    except Exception as e:
-                        print(f"❌ Error eliminando {item}: {e}")
+    _clean_dir(root, cleaned)
 
     if cleaned:
         print(f"✅ Limpiados {len(cleaned)} items:")
-        for item in cleaned[:20]:  # Mostrar solo los primeros 20
-            print(f"   {item}")
-        if len(cleaned) > 20:
-            print(f"   ... y {len(cleaned) - 20} más")
+        # En CI (sin TTY) el detalle por item es ruido en el log: con el
+        # conteo alcanza y se ahorra el formateo de N líneas
+        if sys.stdout.isatty():
+            # DirEntry.path ya es absoluta bajo root: basta recortar el
+            # prefijo, sin el re-parseo por componente de relpath
+            prefix_len = len(root) + len(os.sep)
+            for icon, path in cleaned[:20]:  # Mostrar solo los primeros 20
+                print(f"   {icon} {path[prefix_len:]}")
+            if len(cleaned) > 20:
+                print(f"   ... y {len(cleaned) - 20} más")
     else:
         print("✅ No hay nada que limpiar. Proyecto limpio!")
 
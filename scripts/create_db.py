@@ -7,6 +7,7 @@ Ejecutar: python -m scripts.create_db
 import sys
 from pathlib import Path
 import psycopg2
+from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 from dotenv import load_dotenv
 import os
@@ -64,7 +65,11 @@ def create_database():
             # Crear la base de datos
             print(f"X La base de datos '{db_name}' no existe")
             print(f"\n[3/3] Creando base de datos '{db_name}'...")
-            cursor.execute(f'CREATE DATABASE {db_name}')
+            # sql.Identifier cita el nombre del lado del cliente: sin
+            # interpolar el valor del .env crudo dentro del SQL
+            cursor.execute(
+                sql.SQL("CREATE DATABASE {}").format(sql.Identifier(db_name))
+            )
             print(f"OK Base de datos '{db_name}' creada exitosamente!")
 
         cursor.close()
@@ -16,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Importar ambos scripts
 from scripts.create_db import create_database
 from scripts.init_db import init_db
+from app.core.database import engine
 
 
 def setup_complete_database():
@@ -33,6 +34,11 @@ def setup_complete_database():
         print("\nX Error al crear la base de datos. Abortando...")
         return False
 
+    # Pre-calentar el pool: la primera conexión paga el handshake
+    # TCP+TLS+auth completo de Postgres (2-4 RTT en Azure); abrirla acá
+    # evita cargarle ese costo a la primera query de init_db
+    engine.connect().close()
+
     # Paso 2: Crear tablas e insertar datos
     print("\n\nPASO 2: Crear tablas e insertar datos de ejemplo")
     print("-" * 60)
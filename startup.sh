@@ -1,2 +1,4 @@
 #!/bin/bash
-gunicorn -w 2 -k uvicorn.workers.UvicornWorker app.main:app --bind=0.0.0.0:8000 --timeout 600 --log-level=debug
\ No newline at end of file
+# One-shot schema migration before workers boot: keeps DDL out of the app process
+alembic upgrade head
+gunicorn -w 2 -k uvicorn.workers.UvicornWorker app.main:app --bind=0.0.0.0:8000 --timeout 600 --log-level=debug
@@ -3,42 +3,122 @@ Pytest configuration and fixtures.
 """
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from passlib.context import CryptContext
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import app.core.security as security
 from app.main import app
 from app.core.database import Base, get_db
+from app.models.user import User
 
-# Test database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# Test database URL: SQLite en memoria con StaticPool (una única conexión
+# compartida), sin archivo test.db ni fsyncs de por medio
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# pysqlite emite COMMITs implícitos que rompen los SAVEPOINT; el arreglo
+# documentado es desactivar su manejo de transacciones y emitir BEGIN
+# a mano (ver "Serializable isolation / Savepoints" en los docs de SA)
+@event.listens_for(engine, "connect")
+def _sqlite_disable_implicit_begin(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _sqlite_emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+# join_transaction_mode="create_savepoint": commits inside a test solo
+# liberan un SAVEPOINT; el rollback de la transacción externa al final de
+# cada test descarta todo sin recrear el schema
+TestingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, join_transaction_mode="create_savepoint"
+)
+
+# Sesión del test en curso, servida por el override de get_db
+_current_db = None
+
+
+@pytest.fixture(autouse=True, scope="session")
+def fast_password_hashing():
+    """bcrypt con cost 4 para los tests: cada hash pasa de ~250 ms a ~1 ms."""
+    original = security.pwd_context
+    security.pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    yield
+    security.pwd_context = original
+
+
+@pytest.fixture(scope="session")
+def prehashed_password(fast_password_hashing):
+    """Hash de "testpass123" calculado una sola vez por sesión."""
+    return security.get_password_hash("testpass123")
 
 
 @pytest.fixture(scope="function")
-def db():
-    """Create a fresh database for each test."""
+def seeded_user(db, prehashed_password):
+    """Usuario sembrado directo en la BD, sin pasar por /register."""
+    user = User(
+        email="test@example.com",
+        username="testuser",
+        full_name="Test User",
+        hashed_password=prehashed_password,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture(scope="session")
+def _schema():
+    """Create the schema once per session instead of per test."""
     Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db(_schema):
+    """Session wrapped in an outer transaction rolled back after each test."""
+    global _current_db
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection)
+    _current_db = db
     try:
         yield db
     finally:
+        _current_db = None
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
-@pytest.fixture(scope="function")
-def client(db):
-    """Create a test client with database override."""
-    def override_get_db():
-        try:
-            yield db
-        finally:
-            pass
-
-    app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
+def _override_get_db():
+    try:
+        yield _current_db
+    finally:
+        pass
+
+
+@pytest.fixture(scope="session")
+def _test_client():
+    """Single TestClient for the whole session (one app startup)."""
+    app.dependency_overrides[get_db] = _override_get_db
+    # base_url con host de ALLOWED_HOSTS: el default "testserver" choca
+    # con TrustedHostMiddleware cuando DEBUG=False (400 Invalid host)
+    with TestClient(app, base_url="http://localhost") as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def client(db, _test_client):
+    """Test client bound to the current test's transactional session."""
+    return _test_client
@@ -43,19 +43,10 @@ def test_register_duplicate_email(client: TestClient):
     assert "already registered" in response.json()["detail"].lower()
 
 
-def test_login(client: TestClient):
+def test_login(client: TestClient, seeded_user):
     """Test user login."""
-    # First register a user
-    client.post(
-        "/api/v1/auth/register",
-        json={
-            "email": "test@example.com",
-            "username": "testuser",
-            "password": "testpass123"
-        }
-    )
-
-    # Then login
+    # User seeded directly in the DB (no register round-trip); login
+    # still exercises the real password verify path
     response = client.post(
         "/api/v1/auth/login",
         data={